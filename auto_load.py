@@ -1,5 +1,7 @@
 import bpy
+import json
 import typing
+import hashlib
 import inspect
 import pkgutil
 import importlib
@@ -21,8 +23,18 @@ def init():
     global modules
     global ordered_classes
 
-    modules = get_all_submodules(Path(__file__).parent)
+    directory = Path(__file__).parent
+    module_names = sorted(iter_submodule_names(directory))
+    signature = get_cache_signature(directory, module_names)
+
+    cached = load_registration_cache(directory, signature)
+    if cached is not None:
+        modules, ordered_classes = cached
+        return
+
+    modules = [importlib.import_module("." + name, directory.name) for name in module_names]
     ordered_classes = get_ordered_classes_to_register(modules)
+    save_registration_cache(directory, signature, modules, ordered_classes)
 
 
 def register():
@@ -62,12 +74,88 @@ def iter_submodules(path, package_name):
 
 def iter_submodule_names(path, root=""):
     for _, module_name, is_package in pkgutil.iter_modules([str(path)]):
+        # Packages are modules too, their __init__ may register something of its own
+        yield root + module_name
         if is_package:
             sub_path = path / module_name
             sub_root = root + module_name + "."
             yield from iter_submodule_names(sub_path, sub_root)
-        else:
-            yield root + module_name
+
+
+# Cache the registration order
+#################################################
+
+# The full scan imports every submodule and toposorts the classes. The result only changes when the sources do,
+# so it is cached and later starts import just the modules that register something.
+CACHE_VERSION = 1
+
+
+def get_cache_path(directory):
+    # Blender's user config survives addon updates and is writable when the addon folder is not
+    return Path(bpy.utils.user_resource("CONFIG", path=directory.name, create=True)) / "auto_load_cache.json"
+
+
+def get_module_path(directory, name):
+    path = directory.joinpath(*name.split("."))
+    if path.is_dir():
+        return path / "__init__.py"
+    return path.with_suffix(".py")
+
+
+def get_cache_signature(directory, module_names):
+    """Hash the addon location, the Blender version and the size and mtime of every submodule."""
+    files = []
+    for name in module_names:
+        try:
+            stat = get_module_path(directory, name).stat()
+            files.append((name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            files.append((name, 0, 0))
+    # The cache is shared by every checkout with the same folder name, its location is part of the signature
+    payload = json.dumps([CACHE_VERSION, str(directory), list(blender_version), files])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_registration_cache(directory, signature):
+    """Import the cached modules and return (modules, ordered_classes), or None when the cache is stale."""
+    try:
+        with open(get_cache_path(directory), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cache.get("signature") != signature:
+        return None
+
+    try:
+        cached_modules = {name: importlib.import_module("." + name, directory.name) for name in cache["modules"]}
+        cached_classes = []
+        for module_name, qualname in cache["classes"]:
+            value = cached_modules[module_name]
+            for attribute in qualname.split("."):
+                value = getattr(value, attribute)
+            cached_classes.append(value)
+    except (ImportError, AttributeError, KeyError):
+        return None
+    return list(cached_modules.values()), cached_classes
+
+
+def save_registration_cache(directory, signature, modules, ordered_classes):
+    """Store the registration order and the modules it needs; failing to write only costs the next start."""
+    package_prefix = directory.name + "."
+    needed = {cls.__module__ for cls in ordered_classes}
+    needed.update(module.__name__ for module in modules if module.__name__ != __name__ and hasattr(module, "register"))
+
+    cache = {
+        "signature": signature,
+        "modules": sorted(name[len(package_prefix) :] for name in needed if name.startswith(package_prefix)),
+        "classes": [(cls.__module__[len(package_prefix) :], cls.__qualname__) for cls in ordered_classes],
+    }
+    try:
+        cache_path = get_cache_path(directory)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
 
 
 # Find classes to register
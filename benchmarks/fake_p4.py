@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+A tiny stand-in for the p4 command line client, enough to run the BBatch Perforce workflow without a server.
+
+    chmod +x benchmarks/fake_p4.py
+    BBATCH_P4=/path/to/BBatch/benchmarks/fake_p4.py blender -b level.blend --python-expr "import BBatch.cli; BBatch.cli.main()" -- ...
+
+The depot lives in a JSON file (FAKE_P4_STATE, default fake_p4_state.json in the working directory). Files listed in
+its "depot" map count as checked in; seed it with the paths of existing exports to exercise the edit path.
+Supports: set, login, info, fstat, edit, add, reopen, revert -a, opened, change -i and change -d, with -G and -x -.
+"""
+
+import os
+import sys
+import json
+import stat
+import hashlib
+import marshal
+
+STATE_PATH = os.environ.get("FAKE_P4_STATE", "fake_p4_state.json")
+
+
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"depot": {}, "opened": {}, "changes": [], "next_change": 1}
+
+
+def save_state(state: dict):
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+
+
+def digest(path: str):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def parse_args(argv):
+    """Split the global options from the command, return (options, command, arguments)."""
+    options = {"G": False, "x": None}
+    index = 0
+    while index < len(argv) and argv[index].startswith("-"):
+        option = argv[index][1:]
+        if option == "G":
+            options["G"] = True
+        elif option in ("p", "u", "c", "P", "x"):
+            index += 1
+            options[option] = argv[index]
+        index += 1
+    return options, argv[index], argv[index + 1 :]
+
+
+def pop_option(args: list, name: str):
+    if name in args:
+        position = args.index(name)
+        value = args[position + 1]
+        del args[position : position + 2]
+        return value
+    return None
+
+
+def main(argv) -> int:
+    options, command, args = parse_args(argv)
+    state = load_state()
+    records = []
+    text = []
+    paths = list(args)
+    if options["x"] == "-":
+        paths += [line.strip() for line in sys.stdin if line.strip()]
+
+    if command == "set":
+        text.append("P4PORT=fake:1666")
+        text.append("P4USER=fake_user")
+        text.append("P4CLIENT=fake_client")
+    elif command == "login":
+        if "-p" in args:
+            sys.stdin.read()
+            text.append("FAKETICKET")
+        else:
+            records.append({"code": "stat", "User": "fake_user"})
+    elif command == "info":
+        records.append(
+            {"code": "stat", "serverAddress": "fake:1666", "userName": options.get("u") or "fake_user", "clientName": options.get("c") or "fake_client"}
+        )
+    elif command == "fstat":
+        for path in paths:
+            path = key(path)
+            record = {"code": "stat", "clientFile": path}
+            if path in state["depot"]:
+                record.update(depotFile="//depot/" + os.path.basename(path), headRev=str(state["depot"][path]["rev"]), headAction="edit")
+            if path in state["opened"]:
+                record["action"] = state["opened"][path]["action"]
+                record["change"] = state["opened"][path]["change"]
+            if len(record) > 2:
+                records.append(record)
+            else:
+                records.append({"code": "error", "data": f"{path} - no such file(s).\n"})
+    elif command in ("edit", "add", "reopen"):
+        change = pop_option(paths, "-c") or "default"
+        for path in paths:
+            path = key(path)
+            if command == "reopen":
+                if path in state["opened"]:
+                    state["opened"][path]["change"] = change
+                    records.append({"code": "stat", "clientFile": path})
+            elif (command == "edit") != (path in state["depot"]):
+                records.append({"code": "error", "data": f"{path} - can't {command} file.\n"})
+            else:
+                state["opened"][path] = {"action": command, "change": change, "digest": digest(path)}
+                records.append({"code": "stat", "clientFile": path, "action": command})
+                if command == "edit":
+                    # Like p4, opening a synced file for edit makes it writable
+                    os.chmod(path, os.stat(path).st_mode | stat.S_IWUSR)
+    elif command == "revert":
+        change = pop_option(paths, "-c")
+        for path, opened in list(state["opened"].items()):
+            unchanged = opened["action"] == "edit" and opened["digest"] == digest(path)
+            if (change is None or opened["change"] == change) and ("-a" not in paths or unchanged):
+                del state["opened"][path]
+                records.append({"code": "stat", "clientFile": path, "action": "reverted"})
+    elif command == "opened":
+        change = pop_option(paths, "-c")
+        for path, opened in state["opened"].items():
+            if change is None or opened["change"] == change:
+                records.append({"code": "stat", "clientFile": path, "action": opened["action"], "change": opened["change"]})
+    elif command == "change":
+        if "-i" in args:
+            sys.stdin.read()
+            change = str(state["next_change"])
+            state["next_change"] += 1
+            state["changes"].append(change)
+            text.append(f"Change {change} created.")
+        elif "-d" in args:
+            change = args[args.index("-d") + 1]
+            if any(opened["change"] == change for opened in state["opened"].values()):
+                sys.stderr.write(f"Change {change} has 1 open file(s) associated with it and can't be deleted.\n")
+                return 1
+            state["changes"].remove(change)
+            text.append(f"Change {change} deleted.")
+    else:
+        sys.stderr.write(f"Unknown command '{command}'.\n")
+        return 1
+
+    save_state(state)
+    if options["G"]:
+        for record in records:
+            marshal.dump(record, sys.stdout.buffer, 0)
+    else:
+        text += [record.get("data", "").strip() for record in records if "data" in record]
+        print("\n".join(text))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
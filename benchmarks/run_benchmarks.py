@@ -0,0 +1,174 @@
+"""
+Time Base_Export.do_export for every exporter on synthetic scenes and write the results as JSON.
+
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --output results.json
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --cases cases.json --formats .fbx .obj
+
+A cases file is a JSON list of scene_generator parameter sets, e.g. [{"objects": 5000, "depth": 4, "materials": 3}].
+Next to the full exports, the preparation phases (get_children, hierarchy index, both renaming modes, material
+collapse) are timed on their own. Results carry the Blender version and the git commit, so runs can be compared
+across both.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import importlib
+import subprocess
+
+import bpy
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from scene_generator import DEFAULT_CASE, generate_scene  # noqa: E402
+
+DEFAULT_CASES = [
+    dict(DEFAULT_CASE),
+    dict(DEFAULT_CASE, objects=5000, depth=4),
+    dict(DEFAULT_CASE, faces=10000, materials=4),
+    dict(DEFAULT_CASE, suffix_share=0.9),
+    dict(DEFAULT_CASE, animated=True),
+]
+
+
+def load_addon():
+    """Import and enable the addon from this checkout and return its package name."""
+    import addon_utils
+
+    sys.path.insert(0, os.path.dirname(ADDON_DIR))
+    package = os.path.basename(ADDON_DIR)
+    addon_utils.enable(package, default_set=True)
+    return package
+
+
+def git_commit() -> str:
+    """Return the commit of the checkout, or an empty string outside of git."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ADDON_DIR, capture_output=True, text=True)
+        return result.stdout.strip()
+    except OSError:
+        return ""
+
+
+def time_export(exporter_class, roots, export_folder: str) -> dict:
+    """Run one export and return its duration and outcome."""
+    exporter = exporter_class(bpy.context, export_objects=roots, export_folder=export_folder, use_perforce=False, incremental_export=False, show_report=False)
+    start = time.perf_counter()
+    exporter.do_export()
+    duration = time.perf_counter() - start
+    return {
+        "seconds": duration,
+        "exported": len(exporter.exported_files),
+        "skipped": len(exporter.skipped_exports),
+    }
+
+
+def time_phases(exporter_class, roots, get_children) -> dict:
+    """Time the scene preparation phases on their own, without writing any file."""
+    props = bpy.context.scene.panel_properties
+    phases = {}
+
+    start = time.perf_counter()
+    for root_obj in roots:
+        get_children(root_obj)
+    phases["get_children"] = time.perf_counter() - start
+
+    exporter = exporter_class(bpy.context, export_objects=roots, use_perforce=False, show_report=False)
+    start = time.perf_counter()
+    exporter.hierarchy.rebuild()
+    export_sets = [[root_obj] + exporter.hierarchy.get_descendants(root_obj) for root_obj in roots]
+    phases["hierarchy_index"] = time.perf_counter() - start
+
+    # The phases switch panel settings, the full exports timed afterwards must run with the defaults again
+    settings = ("name_isolation", "one_material_ID", "center_transform", "non_destructive", "deduplicate_instances")
+    original_settings = {setting: getattr(props, setting) for setting in settings}
+    try:
+        # Renaming every object only happens on in-place exports, copies in a scratch scene never rename
+        props.center_transform = props.non_destructive = props.deduplicate_instances = False
+        for mode in ("COLLISIONS", "ALL"):
+            props.name_isolation = mode
+            exporter = exporter_class(bpy.context, export_objects=roots, use_perforce=False, show_report=False)
+            start = time.perf_counter()
+            exporter.store_original_names()
+            for export_set in export_sets:
+                exporter.current_export_objects = export_set
+                exporter.isolate_export_names()
+                exporter.restore_original_names()
+            phases[f"rename_{mode.lower()}"] = time.perf_counter() - start
+
+        props.one_material_ID = True
+        exporter = exporter_class(bpy.context, export_objects=roots, use_perforce=False, show_report=False)
+        start = time.perf_counter()
+        for root_obj in roots:
+            if exporter.remove_materials(root_obj):
+                exporter.restore_materials(root_obj)
+        phases["material_collapse"] = time.perf_counter() - start
+    finally:
+        for setting, value in original_settings.items():
+            setattr(props, setting, value)
+
+    return phases
+
+
+def run_case(case: dict, exporter_classes: dict, formats, get_children) -> dict:
+    """Generate the scene of one case and time every requested exporter on it."""
+    start = time.perf_counter()
+    roots = generate_scene(**case)
+    result = {"case": case, "roots": len(roots), "generate_seconds": time.perf_counter() - start, "exporters": {}}
+    result["phases"] = time_phases(exporter_classes[formats[0]], roots, get_children)
+
+    for export_format in formats:
+        export_folder = tempfile.mkdtemp(prefix="bbatch_bench_")
+        try:
+            result["exporters"][export_format] = time_export(exporter_classes[export_format], roots, export_folder)
+        except Exception as e:
+            result["exporters"][export_format] = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            shutil.rmtree(export_folder, ignore_errors=True)
+
+        print(f"{export_format} {case}: {result['exporters'][export_format]}")
+
+    return result
+
+
+def parse_args(argv):
+    """Parse the arguments passed after `--` on the Blender command line."""
+    parser = argparse.ArgumentParser(prog="run_benchmarks", description="Benchmark the BBatch export pipeline.")
+    parser.add_argument("--output", default="bbatch_benchmark.json", help="file to write the JSON results to")
+    parser.add_argument("--cases", help="JSON file with a list of scene_generator parameter sets")
+    parser.add_argument("--formats", nargs="+", help="formats to benchmark, all exporters by default")
+    return parser.parse_args(argv[argv.index("--") + 1 :] if "--" in argv else [])
+
+
+def main():
+    args = parse_args(sys.argv)
+    package = load_addon()
+    exporter_classes = importlib.import_module(f"{package}.core.exporters").get_exporter_classes()
+    get_children = importlib.import_module(f"{package}.core.utils").get_children
+
+    cases = DEFAULT_CASES
+    if args.cases:
+        with open(args.cases, "r", encoding="utf-8") as f:
+            cases = [dict(DEFAULT_CASE, **case) for case in json.load(f)]
+
+    formats = args.formats or sorted(exporter_classes)
+    results = {
+        "blender": bpy.app.version_string,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [run_case(case, exporter_classes, formats, get_children) for case in cases],
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
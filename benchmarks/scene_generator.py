@@ -0,0 +1,119 @@
+"""
+Generate synthetic scenes to benchmark the export pipeline.
+
+    blender -b --factory-startup --python benchmarks/scene_generator.py -- --objects 2000 --depth 3 --faces 500 --save synthetic.blend
+
+Every knob that drives a known cost of the pipeline is a parameter: object count (hierarchy index, renaming passes),
+hierarchy depth (descendant collection), faces per mesh and material slots (single material ID collapse),
+share of .001-suffixed names (name isolation) and animation.
+"""
+
+import sys
+import math
+import random
+import argparse
+
+import bpy
+
+DEFAULT_CASE = {
+    "objects": 1000,
+    "depth": 2,
+    "faces": 100,
+    "materials": 1,
+    "suffix_share": 0.25,
+    "animated": False,
+    "seed": 0,
+}
+
+
+def clear_scene():
+    """Remove every object, mesh, material and action."""
+    for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.actions):
+        for datablock in list(collection):
+            collection.remove(datablock)
+
+
+def make_grid_mesh(name: str, faces: int, material_count: int, materials):
+    """Build a flat grid with at least `faces` quads, cycling the faces through the material slots."""
+    size = max(1, math.ceil(math.sqrt(faces)))
+    vertices = [(x, y, 0.0) for y in range(size + 1) for x in range(size + 1)]
+    polygons = []
+    for y in range(size):
+        for x in range(size):
+            i = y * (size + 1) + x
+            polygons.append((i, i + 1, i + size + 2, i + size + 1))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices, [], polygons)
+    for material in materials[:material_count]:
+        mesh.materials.append(material)
+    if material_count > 1:
+        mesh.polygons.foreach_set("material_index", [index % material_count for index in range(len(mesh.polygons))])
+    mesh.update()
+    return mesh
+
+
+def animate(obj, rng):
+    """Key a short location animation on the object."""
+    for frame in (1, 25, 50):
+        obj.location = (rng.uniform(-10, 10), rng.uniform(-10, 10), rng.uniform(0, 5))
+        obj.keyframe_insert("location", frame=frame)
+
+
+def generate_scene(objects=1000, depth=2, faces=100, materials=1, suffix_share=0.25, animated=False, seed=0):
+    """
+    Fill the current scene with `objects` mesh objects arranged in trees of `depth` levels.
+    Returns the root objects, i.e. the objects to export.
+    """
+    rng = random.Random(seed)
+    clear_scene()
+
+    scene = bpy.context.scene
+    material_list = [bpy.data.materials.new(f"MAT_{index}") for index in range(max(1, materials))]
+
+    roots = []
+    parent = None
+    for index in range(objects):
+        # Reusing the name of the previous object makes Blender add a .001 suffix
+        if index > 0 and rng.random() < suffix_share:
+            name = f"Prop_{index - 1}"
+        else:
+            name = f"Prop_{index}"
+
+        mesh = make_grid_mesh(name, faces, materials, material_list)
+        obj = bpy.data.objects.new(name, mesh)
+        scene.collection.objects.link(obj)
+        obj.location = (rng.uniform(-100, 100), rng.uniform(-100, 100), 0.0)
+
+        if index % max(1, depth) == 0:
+            roots.append(obj)
+        else:
+            obj.parent = parent
+        parent = obj
+
+        if animated:
+            animate(obj, rng)
+
+    return roots
+
+
+def parse_args(argv):
+    """Parse the arguments passed after `--` on the Blender command line."""
+    parser = argparse.ArgumentParser(prog="scene_generator", description="Generate a synthetic BBatch benchmark scene.")
+    parser.add_argument("--objects", type=int, default=DEFAULT_CASE["objects"])
+    parser.add_argument("--depth", type=int, default=DEFAULT_CASE["depth"])
+    parser.add_argument("--faces", type=int, default=DEFAULT_CASE["faces"])
+    parser.add_argument("--materials", type=int, default=DEFAULT_CASE["materials"])
+    parser.add_argument("--suffix-share", type=float, default=DEFAULT_CASE["suffix_share"])
+    parser.add_argument("--animated", action="store_true")
+    parser.add_argument("--seed", type=int, default=DEFAULT_CASE["seed"])
+    parser.add_argument("--save", help="save the generated scene to this .blend file")
+    return parser.parse_args(argv[argv.index("--") + 1 :] if "--" in argv else [])
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv)
+    roots = generate_scene(args.objects, args.depth, args.faces, args.materials, args.suffix_share, args.animated, args.seed)
+    print(f"Generated {args.objects} objects in {len(roots)} hierarchies.")
+    if args.save:
+        bpy.ops.wm.save_as_mainfile(filepath=args.save)
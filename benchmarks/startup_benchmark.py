@@ -0,0 +1,79 @@
+"""
+Measure how long enabling the addon takes, with a cold and a warm registration cache.
+
+    blender -b --factory-startup --python benchmarks/startup_benchmark.py -- --runs 20 --output startup.json
+
+Every run disables the addon and drops its modules from sys.modules, so each enable imports the addon from scratch
+like a fresh Blender start would.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import bpy
+import addon_utils
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCHMARK_DIR)
+PACKAGE = os.path.basename(ADDON_DIR)
+# auto_load keeps its cache in the user config folder named after the addon
+CACHE_PATH = os.path.join(bpy.utils.user_resource("CONFIG", path=PACKAGE, create=True), "auto_load_cache.json")
+
+
+def purge_addon():
+    """Disable the addon and forget its modules."""
+    addon_utils.disable(PACKAGE, default_set=False)
+    for name in list(sys.modules):
+        if name == PACKAGE or name.startswith(PACKAGE + "."):
+            del sys.modules[name]
+
+
+def time_enable(cold: bool) -> float:
+    """Enable the addon once and return the seconds it took."""
+    purge_addon()
+    if cold and os.path.exists(CACHE_PATH):
+        os.remove(CACHE_PATH)
+
+    start = time.perf_counter()
+    addon_utils.enable(PACKAGE, default_set=False)
+    return time.perf_counter() - start
+
+
+def summarize(samples) -> dict:
+    return {
+        "runs": len(samples),
+        "mean": statistics.mean(samples),
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def parse_args(argv):
+    """Parse the arguments passed after `--` on the Blender command line."""
+    parser = argparse.ArgumentParser(prog="startup_benchmark", description="Benchmark the BBatch addon enable time.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", default="bbatch_startup.json", help="file to write the JSON results to")
+    return parser.parse_args(argv[argv.index("--") + 1 :] if "--" in argv else [])
+
+
+def main():
+    args = parse_args(sys.argv)
+    sys.path.insert(0, os.path.dirname(ADDON_DIR))
+
+    cold = [time_enable(cold=True) for _ in range(args.runs)]
+    warm = [time_enable(cold=False) for _ in range(args.runs)]
+    purge_addon()
+
+    results = {"blender": bpy.app.version_string, "cold_cache": summarize(cold), "warm_cache": summarize(warm)}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Headless command line entry point, for build farms and nightly asset builds.
+
+    blender -b level.blend --python-expr "import BBatch.cli; BBatch.cli.main()" -- --output D:/export --format fbx --collection Props
+    blender -b level.blend --python path/to/BBatch/cli.py -- --output D:/export --format fbx gltf --root "SM_*"
+    blender -b level.blend --python-expr "import BBatch.cli; BBatch.cli.main()" -- --output D:/export --collection Kits --collection-files --child-collections
+
+Runs the same Base_Export pipeline as the Export button, without popups. Prints (or writes) a JSON result and exits
+with a non-zero code when any asset failed.
+"""
+
+import os
+import sys
+import json
+import fnmatch
+import argparse
+import traceback
+
+import bpy
+
+EXIT_OK = 0
+EXIT_EXPORT_FAILED = 1
+EXIT_USAGE = 2
+
+
+def add_toggle(parser, name: str, help: str):
+    """Add a --name / --no-name pair that leaves the panel setting alone when neither is given."""
+    dest = name.replace("-", "_")
+    parser.add_argument(f"--{name}", dest=dest, action="store_const", const=True, default=None, help=help)
+    parser.add_argument(f"--no-{name}", dest=dest, action="store_const", const=False, help=argparse.SUPPRESS)
+
+
+def parse_args(argv):
+    """Parse the arguments passed after `--` on the Blender command line."""
+    parser = argparse.ArgumentParser(prog="bbatch", description="Batch export objects of a .blend file.")
+    parser.add_argument("--output", required=True, help="folder to export into")
+    parser.add_argument("--format", nargs="+", default=["fbx"], help="one or more formats, e.g. fbx gltf")
+    parser.add_argument("--root", nargs="+", default=[], help="root object names or glob patterns")
+    parser.add_argument("--collection", nargs="+", default=[], help="export the top-level objects of these collections")
+    parser.add_argument("--selected", action="store_true", help="export the objects selected in the saved file")
+    parser.add_argument("--collection-files", action="store_true", help="write every --collection into one file instead of one file per object")
+    parser.add_argument("--child-collections", action="store_true", help="with --collection-files, write every child collection into one file")
+    parser.add_argument("--naming", default="{collection}", help="file name rule of --collection-files, e.g. {parent}_{collection}")
+    parser.add_argument("--subfolder", default="", help="sub-folder rule of --collection-files, takes the same tokens as --naming")
+    add_toggle(parser, "center", "center the transform")
+    add_toggle(parser, "single-material", "export one material ID")
+    add_toggle(parser, "animations", "export rig and animations")
+    parser.add_argument("--smoothing", choices=["EDGE", "FACE", "OFF"], help="smoothing information")
+    parser.add_argument("--name-isolation", choices=["COLLISIONS", "ALL"], help="which objects are renamed aside")
+    add_toggle(parser, "incremental", "skip unchanged assets")
+    add_toggle(parser, "non-destructive", "export temporary copies")
+    add_toggle(parser, "resume", "skip the roots an interrupted run of this file already wrote")
+    add_toggle(parser, "deduplicate", "export linked duplicates once and write an instance manifest")
+    add_toggle(parser, "perforce", "check files out of Perforce")
+    parser.add_argument("--single-file", metavar="NAME", help="write all roots into one gltf/glb file with this name")
+    parser.add_argument("--post-export", nargs="+", type=str.upper, choices=["HASH", "COMPRESS", "MIRROR", "PERFORCE"], help="post-export steps")
+    parser.add_argument("--compression", choices=["GZIP", "LZMA"], help="archive format of the compress step")
+    parser.add_argument("--mirror", help="folder the mirror step copies the exported files to")
+    parser.add_argument("--result", help="write the JSON result to this file instead of stdout")
+
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1 :]
+    else:
+        argv = []
+    return parser.parse_args(argv)
+
+
+def apply_panel_options(props, args):
+    """Copy the options given on the command line onto the panel properties of the scene."""
+    options = {
+        "center_transform": args.center,
+        "one_material_ID": args.single_material,
+        "export_animations": args.animations,
+        "export_smoothing": args.smoothing,
+        "name_isolation": args.name_isolation,
+        "incremental_export": args.incremental,
+        "non_destructive": args.non_destructive,
+        "deduplicate_instances": args.deduplicate,
+        "resume_export": args.resume,
+        "single_file_export": True if args.single_file else None,
+        "single_file_name": args.single_file,
+        "post_export_stages": set(args.post_export) if args.post_export is not None else None,
+        "post_export_compression": args.compression,
+        "post_export_mirror_folder": args.mirror,
+    }
+    for name, value in options.items():
+        if value is not None:
+            setattr(props, name, value)
+
+
+def resolve_roots(scene, args):
+    """Return the root objects matching the --root, --collection and --selected arguments, in scene order."""
+    roots = []
+
+    for obj in scene.objects:
+        if any(fnmatch.fnmatchcase(obj.name, pattern) for pattern in args.root):
+            roots.append(obj)
+
+    for collection_name in args.collection:
+        collection = bpy.data.collections.get(collection_name)
+        if collection is None:
+            raise ValueError(f"Collection '{collection_name}' not found.")
+        members = set(collection.all_objects)
+        roots.extend(obj for obj in collection.all_objects if obj.parent not in members)
+
+    if args.selected:
+        roots.extend(obj for obj in scene.objects if obj.select_get())
+
+    # Keep the first occurrence of every object
+    return list(dict.fromkeys(roots))
+
+
+def resolve_units(view_layer, args):
+    """Return the export units of the --collection arguments in --collection-files mode."""
+    from .core.export_units import get_collection_units
+
+    if args.root or args.selected:
+        raise ValueError("--collection-files only exports collections, it cannot be combined with --root or --selected.")
+
+    units = []
+    for collection_name in args.collection:
+        collection = bpy.data.collections.get(collection_name)
+        if collection is None:
+            raise ValueError(f"Collection '{collection_name}' not found.")
+        units.extend(get_collection_units(collection, view_layer, args.child_collections, args.naming, args.subfolder))
+    return units
+
+
+def run(args) -> dict:
+    """Export the requested roots in every requested format from one pass and return the JSON-ready result."""
+    from .core.exporters import create_exporter
+
+    context = bpy.context
+    apply_panel_options(context.scene.panel_properties, args)
+    if args.collection_files:
+        units = resolve_units(context.view_layer, args)
+        roots = [root_obj for unit in units for root_obj in unit.roots]
+    else:
+        units = None
+        roots = resolve_roots(context.scene, args)
+
+    export_formats = [export_format if export_format.startswith(".") else f".{export_format}" for export_format in args.format]
+    result = {"blend": bpy.data.filepath, "output": os.path.abspath(args.output), "formats": export_formats, "success": True}
+    if not roots:
+        result["success"] = False
+        result["error"] = "No objects matched the given roots, collections or selection."
+        return result
+
+    os.makedirs(result["output"], exist_ok=True)
+
+    # Unknown formats raise ValueError, which main() reports as a usage error
+    exporter = create_exporter(
+        context,
+        export_formats,
+        export_objects=roots,
+        export_units=units,
+        export_folder=result["output"],
+        use_perforce=args.perforce,
+        show_report=False,
+    )
+    exporter.do_export()
+
+    result["exported"] = exporter.exported_files
+    result["skipped"] = [{"name": name, "reason": reason} for name, reason in exporter.skipped_exports]
+    result["unchanged"] = exporter.unchanged_exports
+    if exporter.skipped_exports:
+        result["success"] = False
+
+    return result
+
+
+def main(argv=None):
+    """Run the export and exit Blender with 0 on success, 1 when any asset failed and 2 on bad arguments."""
+    import addon_utils
+
+    # The exporters read the addon preferences, make sure the addon is enabled in this Blender session
+    if __package__ not in bpy.context.preferences.addons:
+        addon_utils.enable(__package__, default_set=True)
+
+    try:
+        args = parse_args(sys.argv if argv is None else argv)
+    except SystemExit:
+        sys.exit(EXIT_USAGE)
+
+    try:
+        result = run(args)
+        exit_code = EXIT_OK if result["success"] else EXIT_EXPORT_FAILED
+    except ValueError as e:
+        result = {"success": False, "error": str(e)}
+        exit_code = EXIT_USAGE
+    except Exception as e:
+        # Blender exits with 0 when a --python script raises, always report the failure ourselves
+        traceback.print_exc()
+        result = {"success": False, "error": f"{type(e).__name__}: {e}"}
+        exit_code = EXIT_EXPORT_FAILED
+
+    output = json.dumps(result, indent=2)
+    if args.result:
+        with open(args.result, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    # Started with `blender --python cli.py`: load the addon as a package so its relative imports work
+    import importlib
+
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    importlib.import_module(f"{os.path.basename(addon_dir)}.cli").main()
@@ -0,0 +1,68 @@
+import re
+import os
+
+import bpy
+
+# Characters that are not allowed in file and folder names on any platform
+INVALID_NAME_CHARACTERS = re.compile(r'[<>:"/\\|?*]')
+
+NAME_TOKEN = re.compile(r"\{(\w+)\}")
+
+
+class ExportUnit:
+    """
+    One set of files written per run: its name, its optional sub-folder and, for collection units, the objects
+    written into it and the collection they come from. Root and single file units leave `objects` to None, they
+    export their roots and children.
+    """
+
+    __slots__ = ("name", "subfolder", "roots", "objects", "source")
+
+    def __init__(self, name: str, roots, objects=None, subfolder: str = "", source: str = ""):
+        self.name = name
+        self.subfolder = subfolder
+        self.roots = list(roots)
+        self.objects = list(objects) if objects is not None else None
+        self.source = source
+
+
+def format_unit_name(rule: str, values: dict) -> str:
+    """Fill the {collection}, {parent} and {blend} tokens of a naming rule, unknown tokens are kept as they are."""
+    name = NAME_TOKEN.sub(lambda match: values.get(match.group(1), match.group(0)), rule)
+    return INVALID_NAME_CHARACTERS.sub("_", name).strip()
+
+
+def get_collection_units(collection, view_layer, use_children: bool = False, naming_rule: str = "{collection}", subfolder_rule: str = ""):
+    """
+    Turn a collection into export units, independent of the selection.
+    The collection is one unit, or with use_children every child collection is one and the objects linked directly
+    to the collection form a unit of their own. An object linked to several collections goes to the first unit only,
+    objects that are not in the view layer cannot be exported and are left out. Units whose naming rules give the
+    same file are all returned, the exporter reports the second one as skipped.
+    """
+    available = set(view_layer.objects)
+    blend_name = os.path.splitext(os.path.basename(bpy.data.filepath))[0] or "untitled"
+
+    if use_children:
+        sources = [(child, collection, child.all_objects) for child in collection.children]
+        sources.append((collection, collection, collection.objects))
+    else:
+        sources = [(collection, None, collection.all_objects)]
+
+    units = []
+    claimed = set()
+    for source, parent, source_objects in sources:
+        objects = [obj for obj in source_objects if obj in available and obj not in claimed]
+        if not objects:
+            continue
+
+        values = {"collection": source.name, "parent": parent.name if parent else "", "blend": blend_name}
+        name = format_unit_name(naming_rule, values) or source.name
+        subfolder = format_unit_name(subfolder_rule, values)
+        claimed.update(objects)
+
+        # The roots are the objects whose parent is not exported with them, they carry the per-root options
+        object_set = set(objects)
+        roots = [obj for obj in objects if obj.parent not in object_set]
+        units.append(ExportUnit(name, roots, objects, subfolder, source=source.name))
+    return units
@@ -1,41 +1,107 @@
-import os
 import importlib
 import bpy
+from bpy.app.handlers import persistent
 from bpy.props import EnumProperty
 
-from .base_export import Base_Export
 
+# Static exporter metadata: format -> (module, class).
+# Modules are only imported once their format is used, so enabling the addon does not load any exporter.
+EXPORTERS = {
+    ".fbx": ("fbx_export", "FBX_Export"),
+    ".obj": ("obj_export", "OBJ_Export"),
+    ".stl": ("stl_export", "STL_Export"),
+    ".gltf": ("gltf_export", "GLTF_Export"),
+    ".glb": ("gltf_export", "GLB_Export"),
+    ".dae": ("dae_export", "DAE_Export"),
+    ".abc": ("abc_export", "ABC_Export"),
+}
 
-exporters_dir = os.path.dirname(os.path.abspath(__file__))
-enum_items = []
-module_members = []
-py_files = [f[:-3] for f in os.listdir(exporters_dir) if f.endswith(".py") and not f.startswith("__")]
+enum_items = [(export_format, export_format.upper(), f"{export_format} format") for export_format in EXPORTERS]
 
-# Import all classes from the Python files
-for module_name in py_files:
-    module_path = f".exporters.{module_name}"
-    module = importlib.import_module(f"{__package__}.{module_name}", package="{module_path}")
+# Files saved before several formats could be chosen store the index of one format in `export_file_format`.
+# The items were built from the exporter modules in directory order, which is alphabetical on Windows and macOS.
+LEGACY_FORMAT_PROPERTY = "export_file_format"
+LEGACY_FORMATS = (".abc", ".dae", ".fbx", ".gltf", ".obj", ".stl")
 
-    # Filter for callable attributes (classes, functions, etc.)
-    module_members.extend([getattr(module, name) for name in dir(module) if (isinstance(getattr(module, name), type) and issubclass(getattr(module, name), Base_Export) and getattr(module, name) != Base_Export)])
-    # Update globals with module members
-    globals().update({getattr(module, name).__name__: getattr(module, name) for name in dir(module) if callable(getattr(module, name))})
+_exporter_classes = {}
 
-for member in module_members:
-    enum_items.append(
-        (
-            member.formats[0],
-            member.formats[0].upper(),
-            f"{member.formats[0]} format",
-        )
-    )
 
+def get_exporter_class(export_format: str):
+    """Return the exporter class for the given format, e.g. '.fbx', importing its module on first use."""
+    exporter_class = _exporter_classes.get(export_format)
+    if exporter_class is None and export_format in EXPORTERS:
+        module_name, class_name = EXPORTERS[export_format]
+        module = importlib.import_module(f".{module_name}", __package__)
+        exporter_class = _exporter_classes[export_format] = getattr(module, class_name)
+    return exporter_class
+
+
+def get_exporter_classes() -> dict:
+    """Return all exporter classes by format, importing every exporter module."""
+    return {export_format: get_exporter_class(export_format) for export_format in EXPORTERS}
+
+
+def create_exporter(context, export_formats, **kwargs):
+    """
+    Create one exporter that writes every root in all given formats from a single preparation pass.
+    Raises ValueError when no format or an unknown format is given.
+    """
+    unknown = [export_format for export_format in export_formats if export_format not in EXPORTERS]
+    if unknown:
+        raise ValueError("Unsupported export format: {}".format(", ".join(unknown)))
+
+    # Keep the order of EXPORTERS so the same selection always produces the same primary exporter
+    export_formats = [export_format for export_format in EXPORTERS if export_format in set(export_formats)]
+    if not export_formats:
+        raise ValueError("No export format selected")
+
+    # Collection units are exported as given, single file mode only applies to the selection
+    props = context.scene.panel_properties
+    use_collections = kwargs.get("export_units") is not None or (kwargs.get("export_objects") is None and props.export_source == "COLLECTION")
+    if use_collections and kwargs.get("export_units") is None and props.export_collection is None:
+        raise ValueError("No collection chosen to export")
+
+    if props.single_file_export and not use_collections:
+        unsupported = [export_format for export_format in export_formats if not get_exporter_class(export_format).supports_single_file]
+        if unsupported:
+            raise ValueError("Single file export is not supported for: {}".format(", ".join(unsupported)))
+
+    exporter = get_exporter_class(export_formats[0])(context, **kwargs)
+    exporter.add_format_exporters(get_exporter_class(export_format) for export_format in export_formats[1:])
+    return exporter
+
+
+def stored_properties(scene):
+    """Return the storage of the addon properties of a scene, kept apart from custom properties since Blender 5.0."""
+    if hasattr(scene, "bl_system_properties_get"):
+        return scene.bl_system_properties_get()
+    return scene
+
+
+@persistent
+def migrate_export_format(_):
+    """Carry the single format chosen in older files over to the format set."""
+    for scene in bpy.data.scenes:
+        properties = stored_properties(scene)
+        if properties is None or LEGACY_FORMAT_PROPERTY not in properties:
+            continue
+        index = properties[LEGACY_FORMAT_PROPERTY]
+        if "export_file_formats" not in properties and isinstance(index, int) and 0 <= index < len(LEGACY_FORMATS):
+            scene.export_file_formats = {LEGACY_FORMATS[index]}
+        del properties[LEGACY_FORMAT_PROPERTY]
+
+
+def register():
+    # Define export formats, several can be enabled at once. A new name, the old one held a single enum index
+    bpy.types.Scene.export_file_formats = EnumProperty(
+        items=enum_items,
+        default={".fbx"},
+        options={"ENUM_FLAG"},
+    )
+    bpy.app.handlers.load_post.append(migrate_export_format)
 
-# Define __all__
-__all__ = [name for name in globals() if not name.startswith("_")]
 
-# Define export enum
-bpy.types.Scene.export_file_format = EnumProperty(
-    items=enum_items,
-    default=".fbx",
-)
+def unregister():
+    if migrate_export_format in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(migrate_export_format)
+    del bpy.types.Scene.export_file_formats
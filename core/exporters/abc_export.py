@@ -5,14 +5,15 @@ from .base_export import Base_Export
 class ABC_Export(Base_Export):
     formats = [".abc"]
 
-    def __init__(self, context):
-        super().__init__(context, format=".abc")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=".abc", **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
         bpy.ops.wm.alembic_export(
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".abc",
+            filepath=filepath,
             selected=True,
             start=bpy.context.scene.frame_start,
             end=bpy.context.scene.frame_end,
-            global_scale=obj.scale[0],
+            # Several roots in one file have no common scale to apply
+            global_scale=roots[0].scale[0] if len(roots) == 1 else 1.0,
         )
@@ -1,36 +1,150 @@
 import bpy
-import bmesh
 import os
 import re
 import logging
-from ..utils import get_object_loc, set_object_to_loc, get_children, get_addon_preferences
-from ..version_control.perforce_manager import PerforceManager
+from array import array
+from ..utils import get_children, get_addon_preferences, HierarchyIndex
+from ..scratch_scene import ScratchScene, scene_override, collapse_materials
+from ..profiling import ExportProfiler
+from ..post_export import PostExportPipeline
+from ..manifest import ExportManifest, fingerprint_objects, format_fingerprint
+from ..journal import ExportJournal, read_journal, material_snapshot_record
+from ..export_units import ExportUnit, get_collection_units
+from ..instancing import group_instances, instance_entry, write_instance_manifest, get_instance_manifest_path
+from ..version_control.perforce_manager import PerforceManager, normalize_path
+from ..version_control.fstat_cache import FstatCache
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def strip_suffix(name: str) -> str:
+    """Return the name without its .xxx suffix."""
+    if re.match(r".*\.\d{3}$", name):
+        return name.rsplit(".", 1)[0]
+    return name
+
+
 class Base_Export:
     formats = []
-
-    def __init__(self, context: bpy.types.Context, format: str):
+    # Whether one file can hold all roots with shared meshes and materials, see the single file mode
+    supports_single_file = False
+
+    def __init__(
+        self,
+        context: bpy.types.Context,
+        format: str,
+        export_objects=None,
+        export_folder: str = None,
+        use_perforce: bool = None,
+        incremental_export: bool = None,
+        show_report: bool = True,
+        profiler: ExportProfiler = None,
+        post_export_stages=None,
+        instance_manifest: bool = True,
+        use_journal: bool = True,
+        export_units=None,
+    ):
+        """
+        Settings come from the panel properties and the addon preferences.
+        The keyword arguments override them, e.g. for headless workers that export a given list of roots.
+        """
         self.__context = context
         props = context.scene.panel_properties
-        self.__export_folder = self._resolve_export_folder(props.export_folder)
-        self.__center_transform = props.center_transform
+        self.__export_folder = export_folder if export_folder is not None else self._resolve_export_folder(props.export_folder)
+        # Collection mode writes every collection into its own file, whatever is selected
+        if export_units is None and export_objects is None and props.export_source == "COLLECTION":
+            export_units = self.get_panel_collection_units(props)
+        self.__export_units = list(export_units) if export_units is not None else None
+        # Single file mode writes all roots into one file at their world placement
+        self.__single_file = props.single_file_export and self.__export_units is None
+        self.__single_file_name = props.single_file_name or "scene"
+        # Roots sharing a file keep their world placement
+        self.__center_transform = props.center_transform and not self.__single_file and self.__export_units is None
+        # Linked duplicates are exported once in their own space, the instance manifest places them
+        self.__deduplicate = props.deduplicate_instances and not self.__single_file and self.__export_units is None
+        self.__instance_manifest = instance_manifest
         self.__one_material_id = props.one_material_ID
-        self.__export_objects = context.selected_objects
+        if self.__export_units is not None:
+            self.__export_objects = [root_obj for unit in self.__export_units for root_obj in unit.roots]
+        else:
+            self.__export_objects = list(export_objects) if export_objects is not None else context.selected_objects
         self.__export_animations = props.export_animations
         self.__export_smoothing = props.export_smoothing
-        self.__mat_faces = {}
-        self.__materials = []
+        self.__name_isolation = props.name_isolation
+        self.__incremental_export = incremental_export if incremental_export is not None else props.incremental_export
+        self.__non_destructive = props.non_destructive
+        # Copies only need the names they take freed up, the full-scene rename pass is for in-place exports
+        self.__rename_all = self.__name_isolation == "ALL" and not (self.__non_destructive or self.__center_transform or self.__deduplicate)
+        self.__material_snapshots = {}
         self.__format = format
         self.original_names = {}
+        self.name_index = {}
+        self.hierarchy = HierarchyIndex()
+        self.scratch = None
+        # The user's selection, restored once at the end, and the objects currently selected by the run
+        self.original_selection = []
+        self.original_active = None
+        self.selected_objects = set()
+        self.show_report = show_report
+        self.__post_export_stages = set(props.post_export_stages if post_export_stages is None else post_export_stages)
+        self.__post_export_compression = props.post_export_compression
+        self.__post_export_mirror_folder = self._resolve_export_folder(props.post_export_mirror_folder)
+        self.__post_export_workers = props.post_export_workers
+        self.post_export = None
+        self.__use_journal = use_journal
+        self.__resume = props.resume_export
+        self.journal = ExportJournal(self.__export_folder)
+        self.__trace_file = bpy.path.abspath(props.trace_file) if props.profile_export and props.trace_file else ""
+        self.profiler = profiler or ExportProfiler(enabled=props.profile_export)
+
+        # Exporters sharing the preparation of every root, see add_format_exporters()
+        self.format_exporters = [self]
+
+        # Results of the run
+        self.export_filepaths = {}
+        self.root_units = {}  # Root -> the unit it is written with
+        self.export_roots = []
+        self.exported_files = []
+        self.skipped_exports = []  # List to track skipped exports and reasons
+        self.unchanged_exports = []
+        self.resumed_exports = []
+        self.fingerprints = {}
+        self.manifest = None
+        self.perforce_plan = {}
+        self.changelist = None
+        self.changelist_report = None
+        self.instances = {}
+        self.next_root_index = 0
+        self.cancelled = False
 
         # Access the addon preferences to get the use_perforce property
         addon_prefs = get_addon_preferences("BBatch")
-        self.use_perforce = addon_prefs.enable_perforce  # Accessing use_perforce from preferences
-        self.perforce_manager = PerforceManager() if self.use_perforce else None  # Initialize Perforce manager only if needed
+        self.use_perforce = addon_prefs.enable_perforce if use_perforce is None else use_perforce
+        fstat_cache = FstatCache(ttl=addon_prefs.p4_cache_ttl * 60) if self.use_perforce and addon_prefs.p4_cache_ttl > 0 else None
+        self.perforce_manager = PerforceManager(profiler=self.profiler, cache=fstat_cache) if self.use_perforce else None  # Initialize Perforce manager only if needed
+        # One numbered changelist per batch instead of the default changelist
+        self.__use_changelist = addon_prefs.p4_use_changelist
+        if self.use_perforce:
+            self.perforce_manager.session.timeout = addon_prefs.p4_timeout or None
+        if self.use_perforce and addon_prefs.connection_status == "SUCCESS":
+            # Reuse the settings that passed the connection test
+            self.perforce_manager.session.configure(addon_prefs.p4_server, addon_prefs.p4_user, addon_prefs.p4_client)
+
+    @property
+    def export_format(self) -> str:
+        """The extension of the files this exporter writes, e.g. '.fbx'."""
+        return self.__format
+
+    @property
+    def export_folder(self) -> str:
+        """The resolved folder the files are written to."""
+        return self.__export_folder
+
+    @property
+    def uses_collection_units(self) -> bool:
+        """Whether the run exports collection units instead of the selection."""
+        return self.__export_units is not None
 
     def _resolve_export_folder(self, export_folder: str) -> str:
         """Resolve the export folder path."""
@@ -38,62 +152,123 @@ class Base_Export:
             return os.path.abspath(bpy.path.abspath(export_folder))
         return export_folder
 
-    def store_original_names(self):
-        """Store the original names of all objects."""
-        for obj in bpy.data.objects:
-            self.original_names[obj] = obj.name
+    def get_panel_collection_units(self, props):
+        """Return the export units of the collection chosen in the panel."""
+        if props.export_collection is None:
+            return []
+        return get_collection_units(
+            props.export_collection,
+            self.__context.view_layer,
+            use_children=props.export_child_collections,
+            naming_rule=props.collection_naming or "{collection}",
+            subfolder_rule=props.collection_subfolder,
+        )
+
+    def get_export_filepath(self, name: str, subfolder: str = "") -> str:
+        """Return the path the object or unit with the given name is exported to."""
+        return os.path.join(self.__export_folder, subfolder, f"{name}{self.__format}")
+
+    def add_format_exporters(self, exporter_classes):
+        """Also export every root with these exporter classes, reusing the preparation of each root."""
+        for exporter_class in exporter_classes:
+            exporter = exporter_class(
+                self.__context, export_objects=(), export_folder=self.__export_folder, use_perforce=False, show_report=False, post_export_stages=()
+            )
+            self.format_exporters.append(exporter)
+
+    def export_formats(self, roots, filepaths, materials_removed):
+        """Let every format exporter write the prepared roots to its file of the batch."""
+        for exporter, filepath in zip(self.format_exporters, filepaths):
+            with self.profiler.span(f"export {exporter.__format}", os.path.basename(filepath)):
+                # Collection units may go to a sub-folder of the export folder
+                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                exporter.export_file(filepath, roots, materials_removed)
+
+    def get_fingerprint_settings(self) -> dict:
+        """Return the format-independent settings that change the exported files, used to fingerprint an asset."""
+        return {
+            "center_transform": self.__center_transform,
+            "non_destructive": self.__non_destructive,
+            "one_material_id": self.__one_material_id,
+            "export_animations": self.__export_animations,
+            "export_smoothing": self.__export_smoothing,
+            "deduplicate": self.__deduplicate,
+        }
 
-    def do_center(self, obj):
-        """Center the object's transform if the setting is enabled."""
-        if self.__center_transform:
-            loc = get_object_loc(obj)
-            set_object_to_loc(obj, (0, 0, 0))
-            return loc
-        return None
+    def store_original_names(self):
+        """Store the original names of all objects, or index them when only collisions are isolated."""
+        if self.__rename_all:
+            for obj in bpy.data.objects:
+                self.original_names[obj] = obj.name
+        else:
+            self.build_name_index()
+
+    def build_name_index(self):
+        """Map every object name to its object, once per run."""
+        self.name_index = {obj.name: obj for obj in bpy.data.objects}
+
+    def get_center_matrix(self, obj):
+        """
+        Return the world-space offset that moves the object's location to (0, 0, 0), or None when centering is off.
+        The offset is applied to the exported copies, the scene object itself is never moved.
+        """
+        if self.__deduplicate:
+            # Instanced assets are written in their own space, undo the whole world transform
+            return obj.matrix_world.inverted_safe()
+        if not self.__center_transform:
+            return None
+
+        centered_basis = obj.matrix_basis.copy()
+        centered_basis.translation = (0, 0, 0)
+        parent_matrix = obj.matrix_world @ obj.matrix_basis.inverted_safe()
+        return parent_matrix @ centered_basis @ obj.matrix_world.inverted_safe()
 
     def remove_materials(self, obj):
-        """Remove materials from the object except the last one, if needed."""
-        if obj.type == "ARMATURE":
+        """Collapse the object's mesh to its last material, keeping a snapshot to restore it."""
+        if obj.type != "MESH" or not self.__one_material_id:
             return False
 
-        mat_count = len(obj.data.materials)
-
-        if mat_count > 1 and self.__one_material_id:
-            bpy.ops.object.mode_set(mode="EDIT")
-            bm = bmesh.from_edit_mesh(obj.data)
-
-            for face in bm.faces:
-                self.__mat_faces[face.index] = face.material_index
+        mesh = obj.data
+        if mesh in self.__material_snapshots:
+            # The mesh is shared with an object that already collapsed it
+            return True
 
-            bpy.ops.object.mode_set(mode="OBJECT")
-            self.__materials.clear()
+        materials = list(mesh.materials)
+        if len(materials) <= 1:
+            return False
 
-            for idx in range(mat_count):
-                self.__materials.append(obj.data.materials[0])
-                if idx < mat_count - 1:
-                    obj.data.materials.pop(index=0)
+        # Snapshot the per-face material indices in bulk, no Edit Mode round trip needed
+        face_count = len(mesh.polygons)
+        material_indices = array("i", [0]) * face_count
+        mesh.polygons.foreach_get("material_index", material_indices)
+        self.__material_snapshots[mesh] = (material_indices, materials)
+        if self.journal.is_open:
+            self.journal.write("materials", **material_snapshot_record(mesh, materials, material_indices))
 
-            return True
-        return False
+        return collapse_materials(mesh)
 
     def restore_materials(self, obj):
         """Restore the materials for the object."""
-        obj.data.materials.clear()
-
-        for mat in self.__materials:
-            obj.data.materials.append(mat)
-
-        obj.data.update()
-
-        bpy.ops.object.mode_set(mode="EDIT")
-        bm = bmesh.from_edit_mesh(obj.data)
-
-        for face in bm.faces:
-            mat_index = self.__mat_faces[face.index]
-            face.material_index = mat_index
-
-        bmesh.update_edit_mesh(obj.data)
-        bpy.ops.object.mode_set(mode="OBJECT")
+        snapshot = self.__material_snapshots.pop(obj.data, None)
+        if snapshot is not None:
+            self.apply_material_snapshot(obj.data, snapshot)
+
+    def restore_all_materials(self):
+        """Restore every mesh that is still collapsed, e.g. after a failed export."""
+        for mesh, snapshot in self.__material_snapshots.items():
+            self.apply_material_snapshot(mesh, snapshot)
+        self.__material_snapshots.clear()
+
+    def apply_material_snapshot(self, mesh, snapshot):
+        """Put the saved material slots and per-face material indices back on the mesh."""
+        material_indices, materials = snapshot
+        mesh.materials.clear()
+        for mat in materials:
+            mesh.materials.append(mat)
+
+        mesh.polygons.foreach_set("material_index", material_indices)
+        mesh.update()
+        self.journal.write("materials_restored", mesh=mesh.name)
 
     def rename_non_export_objects_with_prefix(self, prefix="%BBatch%_"):
         """Rename all non-export objects with the given prefix."""
@@ -101,112 +276,620 @@ class Base_Export:
             if obj not in self.current_export_objects:
                 obj.name = f"{prefix}{obj.name}"
 
+    def rename_colliding_objects_with_prefix(self, prefix="%BBatch%_"):
+        """Rename only the non-export objects holding a name an export object is about to take."""
+        for export_obj in self.current_export_objects:
+            stripped_name = strip_suffix(export_obj.name)
+            if stripped_name == export_obj.name:
+                continue
+
+            holder = self.name_index.get(stripped_name)
+            if holder is None or holder in self.current_export_objects:
+                continue
+
+            self.original_names.setdefault(holder, holder.name)
+            holder.name = f"{prefix}{holder.name}"
+
+    def rename_name_holders_with_prefix(self, names, prefix="%BBatch%_"):
+        """Rename whichever objects currently hold the given names."""
+        for name in names:
+            holder = self.name_index.get(name)
+            if holder is None or holder.name != name:
+                continue
+
+            self.original_names.setdefault(holder, holder.name)
+            holder.name = f"{prefix}{holder.name}"
+
+    def isolate_export_names(self, prefix="%BBatch%_"):
+        """Free up the stripped names of the current export objects and rename them."""
+        if self.__rename_all:
+            self.rename_non_export_objects_with_prefix(prefix)
+        else:
+            self.rename_colliding_objects_with_prefix(prefix)
+
+        # Journal the stripped names before renaming, moved aside objects are recognised by their prefix
+        stripped_names = [(strip_suffix(obj.name), obj.name) for obj in self.current_export_objects if strip_suffix(obj.name) != obj.name]
+        if stripped_names:
+            self.journal.write("names", names=stripped_names)
+
+        for export_obj in self.current_export_objects:
+            self.strip_suffix_and_rename(export_obj)
+
     def strip_suffix_and_rename(self, obj):
         """Strip the .xxx suffix if present from the object's name."""
-        if re.match(r".*\.\d{3}$", obj.name):
-            base_name = obj.name.rsplit(".", 1)[0]  # Strip the .xxx suffix
+        base_name = strip_suffix(obj.name)
+        if base_name != obj.name:
+            self.original_names.setdefault(obj, obj.name)
             obj.name = base_name
 
     def restore_original_names(self):
         """Restore all original names from the stored dictionary."""
-        for obj, original_name in self.original_names.items():
+        # Export objects are stored last, restoring them first frees the names of the objects moved aside.
+        for obj, original_name in reversed(list(self.original_names.items())):
             obj.name = original_name
 
+        # Nothing to journal when no name was changed for this root
+        if self.original_names:
+            self.journal.write("names_restored")
+        if not self.__rename_all:
+            self.original_names.clear()
+
+    def store_selection(self):
+        """Remember the user's selection and active object, the selection deltas of the run start from it."""
+        view_layer = self.__context.view_layer
+        self.original_selection = list(view_layer.objects.selected)
+        self.original_active = view_layer.objects.active
+        self.selected_objects = set(self.original_selection)
+
+    def select_objects(self, objects):
+        """Select exactly these objects, only touching the ones whose state changes since the last call."""
+        view_layer = self.__context.view_layer
+        objects = set(objects)
+        # Every change is recorded once it happened, so a failing select_set() leaves the deltas in sync with the scene
+        for obj in self.selected_objects - objects:
+            obj.select_set(False, view_layer=view_layer)
+            self.selected_objects.discard(obj)
+        for obj in objects - self.selected_objects:
+            obj.select_set(True, view_layer=view_layer)
+            # Hidden objects stay unselected without an error
+            if obj.select_get(view_layer=view_layer):
+                self.selected_objects.add(obj)
+
+    def restore_selection(self):
+        """Give the user back the selection and active object the run started with."""
+        self.select_objects(self.original_selection)
+        self.__context.view_layer.objects.active = self.original_active
+
+    def plan_export(self):
+        """Resolve the target paths, the unchanged roots and the Perforce status of the whole batch up front."""
+        self.plan_roots()
+        perforce_job = self.get_perforce_plan_job()
+        if perforce_job is not None:
+            self.apply_perforce_plan(*perforce_job())
+        self.drop_unwritable_roots()
+        return self.export_roots
+
+    def plan_roots(self):
+        """Resolve the target paths of every root and leave out the resumed and unchanged ones."""
+        # Build the parent -> children map once for the whole run
+        with self.profiler.span("hierarchy"):
+            self.hierarchy.rebuild()
+
+        # Only the first root of every group of linked duplicates is exported
+        roots = list(self.__export_objects)
+        if self.__deduplicate:
+            with self.profiler.span("instancing"):
+                self.instances = group_instances(
+                    roots, lambda root_obj: [root_obj] + get_children(root_obj, self.hierarchy), self.__export_animations
+                )
+            roots = list(self.instances)
+
+        # Every unit is written once per format exporter: a collection, all roots in single file mode, or one root
+        if self.__export_units is not None:
+            units = self.__export_units
+        elif self.__single_file:
+            units = [ExportUnit(self.__single_file_name, roots)] if roots else []
+        else:
+            units = [ExportUnit(strip_suffix(root_obj.name), [root_obj]) for root_obj in roots]
+
+        self.export_filepaths = {}
+        self.root_units = {}
+        file_units = {}
+        kept_units = []
+        for unit in units:
+            filepaths = [exporter.get_export_filepath(unit.name, unit.subfolder) for exporter in self.format_exporters]
+            # Naming rules can send two collections to the same file, the second one would overwrite the first
+            if unit.objects is not None:
+                other = file_units.setdefault(os.path.normcase(filepaths[0]), unit)
+                if other is not unit:
+                    relative_path = os.path.relpath(filepaths[0], self.__export_folder)
+                    self.skipped_exports.append((unit.source, f"Collection '{other.source}' already exports to {relative_path}"))
+                    continue
+            kept_units.append(unit)
+            for root_obj in unit.roots:
+                self.root_units[root_obj] = unit
+                self.export_filepaths[root_obj] = filepaths
+        roots = [root_obj for unit in kept_units for root_obj in unit.roots]
+        self.export_roots = list(roots)
+
+        # Skip the roots an interrupted run of this file already wrote
+        if self.__resume:
+            state = read_journal(self.journal.filepath)
+            if state.resumable and state.blend == bpy.data.filepath:
+                for root_obj in roots:
+                    if all(path in state.completed_files and os.path.exists(path) for path in self.export_filepaths[root_obj]):
+                        self.resumed_exports.append(root_obj.name)
+                self.export_roots = [root_obj for root_obj in roots if root_obj.name not in self.resumed_exports]
+
+        # Skip the roots whose content did not change since the last run, before Perforce is involved
+        self.manifest = ExportManifest(self.__export_folder).load() if self.__incremental_export else None
+        if self.manifest is not None:
+            settings = self.get_fingerprint_settings()
+            for batch in self.get_export_batches(self.export_roots):
+                with self.profiler.span("fingerprint", self.get_batch_name(batch)):
+                    content = fingerprint_objects(self.get_batch_objects(batch), settings)
+
+                fingerprints = {}
+                for exporter, export_filepath in zip(self.format_exporters, self.export_filepaths[batch[0]]):
+                    fingerprints[export_filepath] = format_fingerprint(content, type(exporter).__name__, exporter.__format)
+
+                # A root is exported again in every format as soon as one of its files is out of date
+                if all(self.manifest.is_up_to_date(path, fingerprint) for path, fingerprint in fingerprints.items()):
+                    self.unchanged_exports.extend(root_obj.name for root_obj in batch)
+                else:
+                    self.fingerprints.update(fingerprints)
+            self.export_roots = [root_obj for root_obj in self.export_roots if root_obj.name not in self.unchanged_exports]
+
+    def get_perforce_plan_job(self):
+        """
+        Return a function that opens the target paths of the planned roots for edit, or None without Perforce.
+        It only talks to the server and returns (changelist, plan), so it may run on the Perforce worker thread.
+        """
+        if not self.use_perforce:
+            return None
+
+        # Every target path of every format is resolved up front so Perforce is queried once for the whole batch
+        paths = [path for root_obj in self.export_roots for path in self.export_filepaths[root_obj]]
+        if self.__deduplicate and self.__instance_manifest:
+            paths.append(get_instance_manifest_path(self.__export_folder))
+        description = self.get_changelist_description() if self.__use_changelist and paths else None
+        manager = self.perforce_manager
+        profiler = self.profiler
+
+        def prepare_files():
+            with profiler.span("perforce"):
+                changelist = manager.create_changelist(description) if description else None
+                return changelist, manager.prepare_files_for_export(paths, changelist=changelist)
+
+        return prepare_files
+
+    def apply_perforce_plan(self, changelist, perforce_plan):
+        """Take over the result of the Perforce plan job."""
+        self.changelist = changelist
+        self.perforce_plan = perforce_plan
+
+    def skip_remaining_roots(self, reason: str):
+        """Skip every root that was not exported yet with the given reason."""
+        for root_obj in self.export_roots[self.next_root_index :]:
+            self.skipped_exports.append((root_obj.name, reason))
+        del self.export_roots[self.next_root_index :]
+
+    def drop_unwritable_roots(self):
+        """Drop the roots that cannot be written before the scene is touched."""
+        for root_obj in list(self.export_roots):
+            for export_filepath in self.export_filepaths[root_obj]:
+                if self.perforce_plan.get(normalize_path(export_filepath)) == "FAILED":
+                    self.skipped_exports.append((root_obj.name, f"Checkout failed: {os.path.basename(export_filepath)}"))
+                    self.export_roots.remove(root_obj)
+                    break
+                if os.path.exists(export_filepath) and not os.access(export_filepath, os.W_OK):
+                    self.skipped_exports.append((root_obj.name, f"File is read-only, skipping export: {os.path.basename(export_filepath)}"))
+                    self.export_roots.remove(root_obj)
+                    break
+
+    def open_journal(self):
+        """Start journaling the run, so it can be resumed or repaired after a crash."""
+        if not self.__use_journal:
+            return
+        self.journal.open(
+            blend=bpy.data.filepath,
+            formats=[exporter.__format for exporter in self.format_exporters],
+            roots=[root_obj.name for root_obj in self.export_roots],
+        )
+
+    def record_done(self, roots, sync: bool = True):
+        """Journal that the files of these roots are completely written, synced to the disk once per batch."""
+        self.journal.write("done", roots=[root_obj.name for root_obj in roots], files=self.export_filepaths[roots[0]])
+        if sync:
+            self.journal.sync()
+
+    def get_export_batches(self, roots):
+        """Split the roots into the groups written together, one per export unit, keeping their order."""
+        batches = {}
+        for root_obj in roots:
+            batches.setdefault(self.root_units[root_obj], []).append(root_obj)
+        return list(batches.values())
+
+    def get_batch_name(self, roots) -> str:
+        """Return the name a batch of roots is reported and profiled under."""
+        return self.root_units[roots[0]].name
+
+    def get_batch_objects(self, roots) -> list:
+        """Return every object written with the roots: the objects of their collection, or the roots and their children."""
+        unit = self.root_units[roots[0]]
+        if unit.objects is not None:
+            return list(unit.objects)
+        return [obj for root_obj in roots for obj in [root_obj] + get_children(root_obj, self.hierarchy)]
+
+    def start_post_export(self):
+        """Start the post-export threads when any post-export step is enabled."""
+        stages = set(self.__post_export_stages)
+        if not self.use_perforce:
+            stages.discard("PERFORCE")
+        if not stages:
+            return
+
+        self.post_export = PostExportPipeline(
+            stages,
+            worker_count=self.__post_export_workers,
+            queue_size=2 * self.__post_export_workers,
+            compression=self.__post_export_compression,
+            mirror_folder=self.__post_export_mirror_folder,
+            export_folder=self.__export_folder,
+            perforce_manager=self.perforce_manager,
+            changelist=self.changelist,
+            profiler=self.profiler,
+        )
+
+    def submit_post_export(self, filepaths):
+        """Hand freshly written files to the post-export threads."""
+        if self.post_export is None:
+            return
+        for path in filepaths:
+            self.post_export.submit(path, add_to_perforce=self.perforce_plan.get(normalize_path(path)) == "ADD")
+
+    def drain_post_export(self):
+        """Wait until every submitted file went through the post-export steps."""
+        if self.post_export is None:
+            return
+        with self.profiler.span("post-export wait"):
+            self.post_export.drain()
+        for path, reason in self.post_export.errors:
+            self.skipped_exports.append((os.path.basename(path), f"Post-export failed: {reason}"))
+
+    def finish_instances(self):
+        """Write the instance manifest: every exported or unchanged asset and where its linked duplicates are placed."""
+        skipped_names = {name for name, _reason in self.skipped_exports}
+        assets = {}
+        instances = []
+        for root_obj, duplicates in self.instances.items():
+            if root_obj.name in skipped_names:
+                continue
+            asset = strip_suffix(root_obj.name)
+            assets[asset] = [os.path.basename(path) for path in self.export_filepaths[root_obj]]
+            for instance_obj in duplicates:
+                instances.append(instance_entry(instance_obj.name, asset, instance_obj.matrix_world))
+
+        filepath = get_instance_manifest_path(self.__export_folder)
+        with self.profiler.span("instancing"):
+            if write_instance_manifest(filepath, assets, instances):
+                self.exported_files.append(filepath)
+
+    def finish_exported_files(self):
+        """Mark the newly written files for add in one go and record their fingerprints."""
+        if self.__deduplicate and self.__instance_manifest:
+            self.finish_instances()
+        perforce_job = self.get_perforce_finish_job()
+        if perforce_job is not None:
+            self.apply_perforce_finish(perforce_job())
+        self.save_manifest()
+
+    def get_perforce_finish_job(self):
+        """
+        Return a function that adds the new files, cleans up the changelist and updates the fstat cache, or None
+        without Perforce. It only talks to the server, so it may run on the Perforce worker thread.
+        """
+        if not self.use_perforce:
+            return None
+
+        post_results = self.post_export.results if self.post_export is not None else {}
+        files_to_add = [
+            path
+            for path in self.exported_files
+            if self.perforce_plan.get(normalize_path(path)) == "ADD" and not post_results.get(path, {}).get("perforce_added")
+        ]
+        exported_files = list(self.exported_files)
+        changelist = self.changelist
+        manager = self.perforce_manager
+        profiler = self.profiler
+
+        def finish_files():
+            with profiler.span("perforce"):
+                if files_to_add:
+                    manager.add_files(files_to_add, changelist=changelist)
+                # Revert the files an export rewrote with identical bytes and drop the changelist if nothing is left
+                changelist_result = None
+                if changelist:
+                    changelist_result = (manager.revert_unchanged(changelist), manager.delete_changelist_if_empty(changelist))
+                manager.update_cache(exported_files)
+            return changelist_result
+
+        return finish_files
+
+    def apply_perforce_finish(self, changelist_result):
+        """Take over the result of the Perforce finish job: the files reverted and whether the changelist was deleted."""
+        if changelist_result is None:
+            return
+
+        reverted, deleted = changelist_result
+        if deleted:
+            self.changelist_report = f"No files changed, changelist {self.changelist} deleted."
+        else:
+            self.changelist_report = f"Changelist {self.changelist}, {len(reverted)} unchanged file(s) reverted."
+        print(f"BBatch: {self.changelist_report}")
+
+    def save_manifest(self):
+        """Record the fingerprints of the written files."""
+        if self.manifest is None:
+            return
+        with self.profiler.span("manifest"):
+            for path in self.exported_files:
+                if path in self.fingerprints:
+                    self.manifest.update(path, self.fingerprints[path])
+            self.manifest.save()
+
+    def get_changelist_description(self) -> str:
+        """Describe the batch for the changelist it is opened in."""
+        blend_name = os.path.basename(bpy.data.filepath) or "unsaved file"
+        formats = ", ".join(exporter.__format for exporter in self.format_exporters)
+        return f"BBatch export from {blend_name}\n\n{len(self.export_roots)} object(s) as {formats} to {self.__export_folder}"
+
     def do_export(self):
-        bpy.ops.object.mode_set(mode="OBJECT")
+        """Export every root in one go."""
+        self.begin_export()
+        try:
+            while self.export_next():
+                pass
+        finally:
+            self.end_export()
+
+    def begin_export(self):
+        """Plan the run and prepare the scene, the roots are then exported one by one with export_next()."""
+        self.prepare_export()
+        perforce_job = self.get_perforce_plan_job()
+        if perforce_job is not None:
+            self.apply_perforce_plan(*perforce_job())
+        self.start_export()
+
+    def prepare_export(self):
+        """First half of begin_export(): plan the roots. The Perforce plan job runs between the two halves."""
+        active_obj = self.__context.view_layer.objects.active
+        if active_obj is not None and active_obj.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+        self.store_selection()
 
-        # Store the original names and positions of all objects before any modifications
-        self.store_original_names()
-        original_positions = {obj: get_object_loc(obj) for obj in self.__export_objects}
+        # Store the original names of all objects before any modifications
+        with self.profiler.span("names"):
+            self.store_original_names()
 
-        skipped_exports = []  # List to track skipped exports and reasons
+        with self.profiler.span("plan"):
+            self.plan_roots()
 
-        for root_obj in self.__export_objects:
-            # Gather the export object and its children for processing
-            self.current_export_objects = [root_obj] + get_children(root_obj)
+    def start_export(self):
+        """Second half of begin_export(): drop the roots that cannot be written and prepare the scene."""
+        self.drop_unwritable_roots()
+        self.open_journal()
 
-            # Step 1: Rename all non-export objects with the prefix
-            self.rename_non_export_objects_with_prefix()
+        # Non-destructive, centered and deduplicated runs export copies that live in a scratch scene
+        use_copies = self.__non_destructive or self.__center_transform or self.__deduplicate
+        self.scratch = ScratchScene(self.__context.scene) if use_copies else None
+        self.next_root_index = 0
+        self.cancelled = False
+        self.start_post_export()
 
-            # Step 2: Strip .xxx suffix and rename export objects
-            for export_obj in self.current_export_objects:
-                # Ensure we don't rename already prefixed objects
-                self.strip_suffix_and_rename(export_obj)
+    def use_context(self, context):
+        """Run the next steps with the context of the current event, a modal operator gets a new one every tick."""
+        self.__context = context
+        for exporter in self.format_exporters:
+            if exporter is not self:
+                exporter.__context = context
+
+    def export_next(self, context=None) -> bool:
+        """Export the next root, or all remaining roots in single file mode, and return True while roots are left."""
+        if context is not None:
+            self.use_context(context)
+        if self.next_root_index >= len(self.export_roots):
+            return False
 
-            # Deselect all and select the export object and its children
-            bpy.ops.object.select_all(action="DESELECT")
-            for export_obj in self.current_export_objects:
-                export_obj.select_set(state=True)
+        roots = self.get_export_batches(self.export_roots[self.next_root_index :])[0]
+        self.next_root_index += len(roots)
+        name = self.get_batch_name(roots)
+
+        # Wrap the export in a try-except block to catch errors during export
+        try:
+            with self.profiler.span("root", name):
+                self.export_root(roots)
+            self.exported_files.extend(self.export_filepaths[roots[0]])
+            self.record_done(roots)
+            self.submit_post_export(self.export_filepaths[roots[0]])
+        except Exception as e:
+            # Add to skipped exports list with a short error message
+            for root_obj in roots:
+                self.skipped_exports.append((root_obj.name, f"Export failed: {type(e).__name__}"))
+            print(f"Error exporting '{name}': {type(e).__name__}")  # Print only the exception type
+
+        return self.next_root_index < len(self.export_roots)
+
+    def end_export(self, cancelled: bool = False, context=None):
+        """Finish the run: record the written files, restore the scene and report. Safe to call after a cancel."""
+        self.stop_export(cancelled, context)
+        perforce_job = self.get_perforce_finish_job()
+        if perforce_job is not None:
+            self.apply_perforce_finish(perforce_job())
+        self.complete_export()
+
+    def stop_export(self, cancelled: bool = False, context=None):
+        """First half of end_export(): restore the scene. The Perforce finish job runs between the two halves."""
+        if context is not None:
+            self.use_context(context)
+        self.cancelled = cancelled
+        if self.scratch is not None:
+            self.scratch.remove()
+            self.scratch = None
+        self.restore_selection()
+
+        if cancelled:
+            self.skip_remaining_roots("Cancelled")
+
+        self.drain_post_export()
+        if self.__deduplicate and self.__instance_manifest:
+            self.finish_instances()
+
+        # Final restoration of original names and materials (if needed)
+        self.restore_original_names()
+        self.restore_all_materials()
+
+    def complete_export(self):
+        """Second half of end_export(): record the fingerprints, close the journal and report."""
+        self.save_manifest()
+        self.journal.close(cancelled=self.cancelled)
+
+        self.finish_profiling()
+
+        if self.show_report:
+            extra_lines = []
+            if self.cancelled:
+                extra_lines.append(f"Cancelled, {len(self.exported_files)} file(s) written before.")
+            if self.profiler.enabled:
+                extra_lines.extend(self.profiler.summary_lines())
+            self.report_results(extra_lines=extra_lines)
+
+    def finish_profiling(self):
+        """Print the timing summary and write the trace file, when profiling is enabled."""
+        if not self.profiler.enabled:
+            return
+
+        print("BBatch export timings:")
+        for line in self.profiler.summary_lines(limit=50):
+            print(f"  {line}")
+        if self.__trace_file:
+            self.profiler.write_chrome_trace(self.__trace_file)
+
+    def export_root(self, roots):
+        """Export a batch of root objects and their children, a single root unless in single file or collection mode."""
+        # Gather the export objects for processing, collections come with their object list
+        with self.profiler.span("hierarchy", self.get_batch_name(roots)):
+            self.current_export_objects = self.get_batch_objects(roots)
+
+        if self.scratch is not None:
+            self.export_root_from_copies(roots)
+        else:
+            self.export_root_in_place(roots)
 
-            # Center selected object
-            old_pos = self.do_center(root_obj)
+    def export_root_in_place(self, roots):
+        """Export the roots by temporarily renaming and stripping the scene objects themselves."""
+        profiler = self.profiler
+        name = self.get_batch_name(roots)
 
-            # Remove materials except the last one
-            materials_removed = self.remove_materials(root_obj)
-
-            export_filename = f"{root_obj.name}{self.__format}"  # Use the format property for extension
-            export_filepath = os.path.join(self.__export_folder, export_filename)
-
-            if self.use_perforce:  # Only check if using Perforce
-                if self.perforce_manager.file_exists(export_filepath):
-                    if self.perforce_manager.is_file_checked_in(export_filepath):
-                        try:
-                            self.perforce_manager.checkout_file(export_filepath)  # Check out the file
-                        except PermissionError:
-                            # Add to skipped exports list with the reason
-                            skipped_exports.append((export_obj.name, "Checkout failed"))
-                            continue  # Skip this object and move to the next
-
-            # Check if the file is read-only before attempting to export
-            if os.path.exists(export_filepath) and not os.access(export_filepath, os.W_OK):
-                skipped_exports.append((root_obj.name, "File is read-only, skipping export."))
-                # Restore the original scene
-                if materials_removed:
-                    self.restore_materials(root_obj)
-                if old_pos is not None:
-                    set_object_to_loc(root_obj, old_pos)
-                self.restore_original_names()
-                continue  # Skip this object and move to the next
-
-            # Wrap the export in a try-except block to catch errors during export
-            try:
-                self.export(root_obj, materials_removed)
-            except Exception as e:
-                # Add to skipped exports list with a short error message
-                skipped_exports.append((export_obj.name, f"Export failed: {type(e).__name__}"))
-                print(f"Error exporting '{root_obj.name}': {type(e).__name__}")  # Print only the exception type
-                continue  # Skip to the next root object
+        collapsed_roots = []
+        try:
+            # Move colliding (or all) non-export objects aside and strip the .xxx suffix of the export objects
+            with profiler.span("names", name):
+                self.isolate_export_names()
 
-            # Restore the materials if they were altered
-            if materials_removed:
-                self.restore_materials(root_obj)
+            # Deselect the previous export objects and select these, objects in both keep their state
+            with profiler.span("selection", name):
+                self.select_objects(self.current_export_objects)
 
-            # Restore the original location
-            if old_pos is not None:
-                set_object_to_loc(root_obj, old_pos)
+            # Remove materials except the last one
+            with profiler.span("materials", name):
+                for root_obj in roots:
+                    if self.remove_materials(root_obj):
+                        collapsed_roots.append(root_obj)
+
+            with profiler.span("export", name):
+                self.export_formats(roots, self.export_filepaths[roots[0]], bool(collapsed_roots))
+        finally:
+            with profiler.span("restore", name):
+                # Restore the materials if they were altered
+                for root_obj in collapsed_roots:
+                    self.restore_materials(root_obj)
 
-            # Restore the original names immediately after exporting this object
-            self.restore_original_names()
+                # Restore the original names immediately after exporting this object
+                self.restore_original_names()
 
-        # Final restoration of original names (if needed)
-        self.restore_original_names()
+    def export_root_from_copies(self, roots):
+        """Export temporary copies of the roots and their children, the scene objects are never modified."""
+        # The copies take the stripped names, so whoever holds those names is moved aside for the duration
+        profiler = self.profiler
+        name = self.get_batch_name(roots)
+        copy_names = {obj: strip_suffix(obj.name) for obj in self.current_export_objects}
+        with profiler.span("names", name):
+            self.rename_name_holders_with_prefix(copy_names.values())
+
+        try:
+            # Only non-destructive runs bake the evaluated meshes, copies made for centering alone export like
+            # the originals. Evaluated copies lose the armature deformation, keep the modifiers for animations.
+            with profiler.span("copies", name):
+                copies = self.scratch.add_objects(
+                    self.current_export_objects,
+                    copy_names,
+                    apply_modifiers=self.__non_destructive and not self.__export_animations,
+                    single_material_objects=set(roots) if self.__one_material_id else (),
+                )
+
+            # Center through the root copies, the children follow through their parent
+            for root_obj in roots:
+                center_matrix = self.get_center_matrix(root_obj)
+                if center_matrix is not None:
+                    copies[root_obj].matrix_world = center_matrix @ root_obj.matrix_world
+
+            materials_removed = self.__one_material_id and any(
+                root_obj.type == "MESH" and len(root_obj.data.materials) > 1 for root_obj in roots
+            )
+
+            with profiler.span("selection", name):
+                self.scratch.select_copies()
+            with profiler.span("export", name), scene_override(self.__context, self.scratch.scene, self.scratch.view_layer):
+                self.export_formats([copies[root_obj] for root_obj in roots], self.export_filepaths[roots[0]], materials_removed)
+        finally:
+            with profiler.span("restore", name):
+                self.scratch.clear()
+                self.restore_original_names()
 
-        # Restore original positions for skipped objects
-        for obj, original_pos in original_positions.items():
-            set_object_to_loc(obj, original_pos)
+    def report_results(self, extra_lines=()):
+        """Show the results of the run in a popup."""
+        if self.changelist_report:
+            extra_lines = [self.changelist_report] + list(extra_lines)
+        if self.resumed_exports:
+            extra_lines = [f"{len(self.resumed_exports)} object(s) already written by the interrupted run."] + list(extra_lines)
+        if self.instances:
+            instance_count = sum(len(duplicates) for duplicates in self.instances.values())
+            extra_lines = [f"{instance_count} object(s) share {len(self.instances)} unique asset(s)."] + list(extra_lines)
+        skipped_exports = self.skipped_exports
+        unchanged_exports = self.unchanged_exports
 
-        # Report the results
         if skipped_exports:
 
             def draw_callback(self, context):
                 self.layout.label(text="Export completed with some issues:")
                 for name, reason in skipped_exports:
                     self.layout.label(text=f"{name}: {reason}")
+                for line in extra_lines:
+                    self.layout.label(text=line)
 
             self.__context.window_manager.popup_menu(draw_callback, title="Warning", icon="ERROR")
         else:
-            self.__context.window_manager.popup_menu(lambda self, context: self.layout.label(text="All objects exported successfully!"), title="Info", icon="INFO")
 
-    def export(self, obj, materials_removed):
-        """Abstract method for exporting; must be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement the export method")
+            def draw_callback(self, context):
+                self.layout.label(text="All objects exported successfully!")
+                if unchanged_exports:
+                    self.layout.label(text=f"{len(unchanged_exports)} unchanged object(s) skipped.")
+                for line in extra_lines:
+                    self.layout.label(text=line)
+
+            self.__context.window_manager.popup_menu(draw_callback, title="Info", icon="INFO")
+
+    def export_file(self, filepath, roots, materials_removed):
+        """Write the selected objects to filepath, `roots` are the root objects among them; must be implemented by subclasses."""
+        raise NotImplementedError("Subclasses must implement the export_file method")
@@ -5,12 +5,12 @@ from .base_export import Base_Export
 class DAE_Export(Base_Export):
     formats = [".dae"]
 
-    def __init__(self, context):
-        super().__init__(context, format=".dae")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=".dae", **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
         bpy.ops.wm.collada_export(
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".dae",
+            filepath=filepath,
             selected=True,
             apply_modifiers=True,
         )
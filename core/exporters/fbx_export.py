@@ -5,13 +5,13 @@ from .base_export import Base_Export
 class FBX_Export(Base_Export):
     formats = [".fbx"]
 
-    def __init__(self, context):
-        super().__init__(context, format=".fbx")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=".fbx", **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
         bpy.ops.export_scene.fbx(
             check_existing=False,
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".fbx",
+            filepath=filepath,
             filter_glob="*.fbx",
             use_selection=True,
             object_types={"MESH", "ARMATURE", "EMPTY"} if self._Base_Export__export_animations else {"MESH", "EMPTY"},
@@ -4,16 +4,29 @@ from .base_export import Base_Export
 
 class GLTF_Export(Base_Export):
     formats = [".gltf"]
+    # glTF JSON with its buffers in a separate .bin
+    gltf_format = "GLTF_SEPARATE"
+    supports_single_file = True
 
-    def __init__(self, context):
-        super().__init__(context, format=".gltf")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=self.formats[0], **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
+        # Every selected root becomes a named node, objects sharing a mesh or material share it in the file too
+        # Blender 4.2 replaced the vertex color toggle with a choice of which colors to write
+        colors = {"export_vertex_color": "ACTIVE"} if bpy.app.version >= (4, 2, 0) else {"export_colors": True}
         bpy.ops.export_scene.gltf(
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".gltf",
+            filepath=filepath,
+            export_format=self.gltf_format,
             export_materials="EXPORT" if materials_removed else "NONE",
-            export_colors=True,
             use_mesh_edges=False,
             use_mesh_vertices=False,
             use_selection=True,
+            **colors,
         )
+
+
+class GLB_Export(GLTF_Export):
+    formats = [".glb"]
+    # Single binary file, JSON chunk and buffers together
+    gltf_format = "GLB"
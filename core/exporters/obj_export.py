@@ -6,12 +6,24 @@ from .base_export import Base_Export
 class OBJ_Export(Base_Export):
     formats = [".obj"]
 
-    def __init__(self, context):
-        super().__init__(context, format=".obj")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=".obj", **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
+        # Blender 4.0 removed the Python OBJ exporter, the C++ one takes the same settings under other names
+        if bpy.app.version >= (4, 0, 0):
+            bpy.ops.wm.obj_export(
+                filepath=filepath,
+                export_selected_objects=True,
+                export_materials=not materials_removed,
+                export_animation=self._Base_Export__export_animations,
+                forward_axis="Y",
+                up_axis="Z",
+                path_mode="COPY",
+            )
+            return
         bpy.ops.export_scene.obj(
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".obj",
+            filepath=filepath,
             use_selection=True,
             use_materials=not materials_removed,
             use_animation=self._Base_Export__export_animations,
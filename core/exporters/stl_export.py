@@ -6,12 +6,23 @@ from .base_export import Base_Export
 class STL_Export(Base_Export):
     formats = [".stl"]
 
-    def __init__(self, context):
-        super().__init__(context, format=".stl")
+    def __init__(self, context, **kwargs):
+        super().__init__(context, format=".stl", **kwargs)
 
-    def export(self, obj, materials_removed):
+    def export_file(self, filepath, roots, materials_removed):
+        # Blender 4.2 removed the Python STL exporter, the C++ one takes the same settings under other names
+        if bpy.app.version >= (4, 2, 0):
+            bpy.ops.wm.stl_export(
+                filepath=filepath,
+                export_selected_objects=True,
+                ascii_format=False,
+                apply_modifiers=True,
+                forward_axis="Y",
+                up_axis="Z",
+            )
+            return
         bpy.ops.export_mesh.stl(
-            filepath=self._Base_Export__export_folder + "/" + obj.name + ".stl",
+            filepath=filepath,
             use_selection=True,
             ascii=False,
             use_mesh_modifiers=True,
@@ -0,0 +1,78 @@
+import os
+import json
+import logging
+
+from .manifest import modifier_values
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+INSTANCE_MANIFEST_NAME = "bbatch_instances.json"
+
+# Digits kept of the child transforms relative to their root, absorbs float noise between duplicates
+MATRIX_PRECISION = 5
+
+
+def instance_signature(objects, include_animation: bool = False) -> tuple:
+    """
+    Return a key that is equal for roots that export to the same file apart from their name and placement.
+    `objects` is the root followed by its children. Meshes are compared by datablock, so only linked
+    duplicates (Alt+D) match; modifiers, materials and the placement of the children relative to the root
+    must match as well.
+    """
+    root_obj = objects[0]
+    root_inverse = root_obj.matrix_world.inverted_safe()
+
+    key = []
+    for obj in objects:
+        local_matrix = () if obj is root_obj else tuple(round(value, MATRIX_PRECISION) for row in root_inverse @ obj.matrix_world for value in row)
+        key.append(
+            (
+                obj.type,
+                obj.data.as_pointer() if obj.data is not None else 0,
+                tuple(slot.material.as_pointer() if slot.material else 0 for slot in obj.material_slots),
+                tuple((modifier.type, *modifier_values(modifier)) for modifier in obj.modifiers),
+                local_matrix,
+                # Animated objects carry their own action, they are only instances of each other with the same one
+                obj.animation_data.action.as_pointer() if include_animation and obj.animation_data and obj.animation_data.action else 0,
+            )
+        )
+    return tuple(key)
+
+
+def group_instances(roots, get_objects, include_animation: bool = False) -> dict:
+    """Group the roots by instance signature, return a map of the first root of every group -> all roots in it."""
+    groups = {}
+    for root_obj in roots:
+        signature = instance_signature(get_objects(root_obj), include_animation)
+        groups.setdefault(signature, []).append(root_obj)
+    return {instances[0]: instances for instances in groups.values()}
+
+
+def instance_entry(name: str, asset: str, matrix_world) -> dict:
+    """Describe one placed instance of an exported asset."""
+    location, rotation, scale = matrix_world.decompose()
+    return {
+        "name": name,
+        "asset": asset,
+        "matrix_world": [list(row) for row in matrix_world],
+        "location": list(location),
+        "rotation_quaternion": list(rotation),
+        "scale": list(scale),
+    }
+
+
+def write_instance_manifest(filepath: str, assets: dict, instances: list) -> bool:
+    """Write the assets (name -> exported files) and their instances as JSON for the engine importer."""
+    try:
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "assets": assets, "instances": instances}, f, indent=1)
+        return True
+    except OSError as e:
+        logger.error(f"Could not write instance manifest '{filepath}': {e}")
+        return False
+
+
+def get_instance_manifest_path(export_folder: str) -> str:
+    """Return where the instance manifest of an export folder is written."""
+    return os.path.join(export_folder, INSTANCE_MANIFEST_NAME)
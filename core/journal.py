@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import zlib
+import base64
+import logging
+from array import array
+
+import bpy
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = ".bbatch_journal.jsonl"
+
+# Prefixes of the temporary names and scenes created by an export run
+NAME_PREFIX = "%BBatch%_"
+SCRATCH_PREFIX = "%BBatch%_Scratch"
+
+
+class ExportJournal:
+    """
+    Append-only log of an export run, stored next to the exported files.
+    Every record is flushed to the OS before the scene is touched, so after a Blender crash the journal still knows
+    which roots were finished and which scene modifications were in flight. Syncing to the disk, which is slow on
+    network shares, happens once per finished batch and when the run begins and ends.
+    """
+
+    def __init__(self, export_folder: str):
+        self.filepath = os.path.join(export_folder, JOURNAL_NAME)
+        self.run_id = None
+        self._file = None
+
+    def open(self, **begin_data):
+        """Start a run. The journal of an interrupted run is appended to, so it can still be resumed and repaired."""
+        mode = "a" if read_journal(self.filepath).resumable else "w"
+        try:
+            # The first run into a new export folder opens the journal before any file created the folder
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            self._file = open(self.filepath, mode, encoding="utf-8")
+        except OSError as e:
+            logger.error(f"Could not open export journal '{self.filepath}': {e}")
+            return
+        self.run_id = f"{time.time_ns():x}"
+        self.write("begin", **begin_data)
+        self.sync()
+
+    @property
+    def is_open(self) -> bool:
+        return self._file is not None
+
+    def write(self, event: str, **data):
+        """Append one record and hand it to the OS, it survives a crash of Blender."""
+        if self._file is None:
+            return
+        record = {"event": event, "run": self.run_id, **data}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def sync(self):
+        """Make sure the records written so far reached the disk, they then survive a crash of the machine too."""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def mark_repaired(self):
+        """Record that the scene modifications journaled so far were undone."""
+        if not os.path.isfile(self.filepath):
+            return
+        with open(self.filepath, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "repaired"}) + "\n")
+
+    def close(self, cancelled: bool = False):
+        """Mark the run as ended. A cancelled run can still be resumed."""
+        self.write("end", cancelled=cancelled)
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class JournalState:
+    """What the journal tells about the runs since the last clean end."""
+
+    def __init__(self):
+        self.blend = None
+        self.resumable = False
+        self.completed_files = set()
+        self.pending_renames = []  # (current name, original name), oldest first
+        self.pending_materials = {}  # mesh name -> material snapshot record
+
+
+def read_journal(filepath: str) -> JournalState:
+    """Replay the journal, ignoring a torn last record."""
+    state = JournalState()
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return state
+
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+
+        event = record.get("event")
+        if event == "begin":
+            state.blend = record.get("blend")
+            state.resumable = True
+        elif event == "done":
+            state.completed_files.update(record.get("files", ()))
+        elif event == "names":
+            state.pending_renames.extend(tuple(pair) for pair in record.get("names", ()))
+        elif event == "names_restored":
+            state.pending_renames.clear()
+        elif event == "materials":
+            state.pending_materials[record["mesh"]] = record
+        elif event == "materials_restored":
+            state.pending_materials.pop(record.get("mesh"), None)
+        elif event == "repaired":
+            state.pending_renames.clear()
+            state.pending_materials.clear()
+        elif event == "end":
+            # Only a cancelled run is worth resuming, a finished one starts the next journal from scratch
+            state.resumable = bool(record.get("cancelled"))
+            if not state.resumable:
+                state.completed_files.clear()
+    return state
+
+
+def material_snapshot_record(mesh, materials, material_indices) -> dict:
+    """Describe a material snapshot so the collapse can be undone from the journal."""
+    return {
+        "mesh": mesh.name,
+        "materials": [mat.name if mat else "" for mat in materials],
+        "indices": base64.b64encode(zlib.compress(material_indices.tobytes())).decode("ascii"),
+    }
+
+
+def repair_scene(state: JournalState) -> dict:
+    """
+    Undo the scene modifications an interrupted run left behind and return what was repaired.
+    Every step checks the scene first, so repairing a scene that was never saved mid-run changes nothing.
+    """
+    repaired = {"scenes": 0, "materials": 0, "names": 0}
+
+    # Scratch scenes hold copies with the stripped names, remove them before the names are given back
+    for scene in [scene for scene in bpy.data.scenes if scene.name.startswith(SCRATCH_PREFIX)]:
+        for obj in list(scene.collection.all_objects):
+            if len(obj.users_scene) == 1:
+                bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.scenes.remove(scene)
+        repaired["scenes"] += 1
+
+    for mesh_name, record in state.pending_materials.items():
+        mesh = bpy.data.meshes.get(mesh_name)
+        materials = [bpy.data.materials.get(name) if name else None for name in record["materials"]]
+        indices = array("i")
+        indices.frombytes(zlib.decompress(base64.b64decode(record["indices"])))
+        # Only a mesh still collapsed to the last material of the snapshot is restored
+        if mesh is None or len(mesh.polygons) != len(indices) or list(mesh.materials) != materials[-1:]:
+            continue
+        mesh.materials.clear()
+        for mat in materials:
+            mesh.materials.append(mat)
+        mesh.polygons.foreach_set("material_index", indices)
+        mesh.update()
+        repaired["materials"] += 1
+
+    # Stripped export objects first, that frees the names of the objects moved aside
+    for current_name, original_name in reversed(state.pending_renames):
+        obj = bpy.data.objects.get(current_name)
+        if obj is not None and original_name not in bpy.data.objects:
+            obj.name = original_name
+            repaired["names"] += 1
+
+    for obj in list(bpy.data.objects):
+        original_name = obj.name
+        while original_name.startswith(NAME_PREFIX):
+            original_name = original_name[len(NAME_PREFIX) :]
+        if original_name != obj.name and original_name not in bpy.data.objects:
+            obj.name = original_name
+            repaired["names"] += 1
+
+    return repaired
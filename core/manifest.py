@@ -0,0 +1,314 @@
+import os
+import json
+import hashlib
+import logging
+from array import array
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".bbatch_manifest.json"
+
+# Attribute data types -> (foreach_get attribute, values per item, array typecode)
+ATTRIBUTE_BUFFERS = {
+    "FLOAT": ("value", 1, "f"),
+    "INT": ("value", 1, "i"),
+    "INT8": ("value", 1, "i"),
+    "BOOLEAN": ("value", 1, "?"),
+    "FLOAT2": ("vector", 2, "f"),
+    "FLOAT_VECTOR": ("vector", 3, "f"),
+    "FLOAT_COLOR": ("color", 4, "f"),
+    "BYTE_COLOR": ("color", 4, "f"),
+    "INT16_2D": ("value", 2, "i"),
+    "INT32_2D": ("value", 2, "i"),
+    "QUATERNION": ("value", 4, "f"),
+}
+
+# Node properties that only change how the node tree is drawn
+NODE_LAYOUT_PROPERTIES = {"location", "location_absolute", "width", "height", "select", "hide", "show_options", "show_preview", "show_texture", "use_custom_color", "color", "label", "parent"}
+
+
+class ExportManifest:
+    """
+    Fingerprints of the assets written by previous runs, stored next to the exported files.
+    An asset can be skipped when its fingerprint matches and its output file was not touched since.
+    """
+
+    def __init__(self, export_folder: str):
+        self.export_folder = export_folder
+        self.filepath = os.path.join(export_folder, MANIFEST_NAME)
+        self.entries = {}
+        self.dirty = False
+
+    def load(self):
+        """Read the manifest, starting empty when it is missing or unreadable."""
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("assets", {})
+        except (OSError, ValueError) as e:
+            if os.path.exists(self.filepath):
+                logger.warning(f"Ignoring unreadable export manifest '{self.filepath}': {e}")
+            self.entries = {}
+        return self
+
+    def save(self):
+        """Write the manifest if anything changed."""
+        if not self.dirty:
+            return
+        try:
+            with open(self.filepath, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "assets": self.entries}, f, indent=1, sort_keys=True)
+            self.dirty = False
+        except OSError as e:
+            logger.error(f"Could not write export manifest '{self.filepath}': {e}")
+
+    def is_up_to_date(self, export_filepath: str, fingerprint: str) -> bool:
+        """Return True when the file was written from the same content and has not changed since."""
+        entry = self.entries.get(manifest_key(export_filepath, self.export_folder))
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        try:
+            stat = os.stat(export_filepath)
+        except OSError:
+            return False
+        return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns")
+
+    def update(self, export_filepath: str, fingerprint: str):
+        """Record the fingerprint of a freshly written file."""
+        try:
+            stat = os.stat(export_filepath)
+        except OSError:
+            return
+        self.entries[manifest_key(export_filepath, self.export_folder)] = {
+            "fingerprint": fingerprint,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self.dirty = True
+
+
+def manifest_key(export_filepath: str, export_folder: str) -> str:
+    """
+    Key files by their path relative to the export folder, so the manifest stays valid when the folder is moved
+    and files with the same name in different sub-folders keep their own entries.
+    """
+    return relative_export_path(export_filepath, export_folder)
+
+
+def relative_export_path(filepath: str, export_folder: str) -> str:
+    """Return the path of an exported file relative to the export folder with / separators, or its name when it is outside."""
+    relative_path = os.path.relpath(os.path.abspath(filepath), os.path.abspath(export_folder)) if export_folder else ""
+    if not relative_path or relative_path.startswith(os.pardir) or os.path.isabs(relative_path):
+        return os.path.basename(filepath)
+    return relative_path.replace(os.sep, "/")
+
+
+def fingerprint_objects(objects, settings: dict) -> str:
+    """Hash everything about the objects and export settings that ends up in the exported file."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+
+    for obj in objects:
+        update_text(digest, obj.name, obj.type, obj.parent.name if obj.parent else "")
+        update_floats(digest, [value for row in obj.matrix_world for value in row])
+        for slot in obj.material_slots:
+            update_text(digest, slot.material.name if slot.material else "")
+            if slot.material is not None:
+                hash_material(digest, slot.material)
+        update_text(digest, *(group.name for group in getattr(obj, "vertex_groups", ())))
+
+        for modifier in obj.modifiers:
+            update_text(digest, modifier.type, *modifier_values(modifier))
+            # Geometry nodes modifiers are only as stable as their node group
+            if getattr(modifier, "node_group", None) is not None:
+                hash_node_tree(digest, modifier.node_group)
+            # Targets are stored by name, their placement and data change the result of the modifier too
+            for target in referenced_objects(modifier):
+                update_text(digest, target.name)
+                update_floats(digest, [value for row in target.matrix_world for value in row])
+                hash_data(digest, target)
+
+        hash_data(digest, obj)
+
+        if settings.get("export_animations") and obj.animation_data and obj.animation_data.action:
+            for fcurve in obj.animation_data.action.fcurves:
+                update_text(digest, fcurve.data_path, str(fcurve.array_index))
+                hash_collection(digest, fcurve.keyframe_points, "co", 2, "f")
+
+    return digest.hexdigest()
+
+
+def format_fingerprint(content_fingerprint: str, exporter_name: str, export_format: str) -> str:
+    """Combine the content fingerprint of an asset with the exporter that writes one of its files."""
+    return hashlib.sha1(f"{content_fingerprint}:{exporter_name}:{export_format}".encode("utf-8")).hexdigest()
+
+
+def referenced_objects(struct) -> list:
+    """
+    Return the objects the pointer properties of a struct point at, e.g. the target of a modifier, and the objects
+    stored in its ID properties, e.g. the object inputs of a geometry nodes modifier.
+    """
+    values = [getattr(struct, prop.identifier, None) for prop in struct.bl_rna.properties if prop.type == "POINTER" and prop.identifier != "rna_type"]
+    if hasattr(struct, "keys"):
+        values.extend(struct[key] for key in struct.keys())
+    # Objects are the only pointed at IDs with a world transform
+    return [value for value in values if value is not None and hasattr(value, "matrix_world")]
+
+
+def hash_data(digest, obj):
+    """Hash the data of an object: mesh buffers, armature bones, or the name of any other data."""
+    if obj.type == "MESH":
+        hash_mesh(digest, obj.data)
+        if getattr(obj, "vertex_groups", None):
+            hash_vertex_weights(digest, obj.data)
+    elif obj.type == "ARMATURE":
+        hash_armature(digest, obj)
+    elif obj.data is not None:
+        update_text(digest, obj.data.name)
+
+
+def hash_armature(digest, obj):
+    """Hash the rest pose of the bones and the current pose, both end up in exported rigs and animations."""
+    bones = obj.data.bones
+    update_text(digest, obj.data.name, *(f"{bone.name}>{bone.parent.name if bone.parent else ''}" for bone in bones))
+    hash_collection(digest, bones, "head_local", 3, "f")
+    hash_collection(digest, bones, "tail_local", 3, "f")
+    hash_collection(digest, bones, "matrix_local", 16, "f")
+    if obj.pose is not None:
+        for attribute, size in (("location", 3), ("rotation_quaternion", 4), ("rotation_euler", 3), ("scale", 3)):
+            hash_collection(digest, obj.pose.bones, attribute, size, "f")
+
+
+def hash_mesh(digest, mesh):
+    """Hash the mesh buffers in bulk through foreach_get."""
+    hash_collection(digest, mesh.vertices, "co", 3, "f")
+    hash_collection(digest, mesh.loops, "vertex_index", 1, "i")
+    hash_collection(digest, mesh.polygons, "loop_total", 1, "i")
+    hash_collection(digest, mesh.polygons, "material_index", 1, "i")
+    hash_collection(digest, mesh.polygons, "use_smooth", 1, "?")
+    hash_collection(digest, mesh.edges, "vertices", 2, "i")
+    hash_collection(digest, mesh.edges, "use_edge_sharp", 1, "?")
+    for uv_layer in mesh.uv_layers:
+        update_text(digest, uv_layer.name)
+        hash_collection(digest, uv_layer.data, "uv", 2, "f")
+
+    # Color attributes, sharp faces and any other attribute the exporters can write
+    for attribute in getattr(mesh, "attributes", ()):
+        if attribute.name == "position" or attribute.name.startswith("."):
+            continue
+        update_text(digest, attribute.name, attribute.domain, attribute.data_type)
+        buffer = ATTRIBUTE_BUFFERS.get(attribute.data_type)
+        if buffer is not None:
+            hash_collection(digest, attribute.data, *buffer)
+    if not hasattr(mesh, "color_attributes"):
+        for color_layer in getattr(mesh, "vertex_colors", ()):
+            update_text(digest, color_layer.name)
+            hash_collection(digest, color_layer.data, "color", 4, "f")
+
+    if getattr(mesh, "has_custom_normals", False):
+        if hasattr(mesh, "corner_normals"):
+            hash_collection(digest, mesh.corner_normals, "vector", 3, "f")
+        else:
+            mesh.calc_normals_split()
+            hash_collection(digest, mesh.loops, "normal", 3, "f")
+
+    if mesh.shape_keys is not None:
+        for key_block in mesh.shape_keys.key_blocks:
+            update_text(digest, key_block.name, key_block.relative_key.name, key_block.vertex_group, str(key_block.mute))
+            update_floats(digest, [key_block.value, key_block.slider_min, key_block.slider_max])
+            hash_collection(digest, key_block.data, "co", 3, "f")
+
+
+def hash_vertex_weights(digest, mesh):
+    """Hash the vertex group weights, they are only reachable per vertex."""
+    for vertex in mesh.vertices:
+        for element in vertex.groups:
+            digest.update(array("d", (vertex.index, element.group, element.weight)).tobytes())
+
+
+def hash_material(digest, material):
+    """Hash the settings of a material and its node tree, shading changes end up in the exported materials."""
+    update_text(digest, *rna_values(material))
+    if getattr(material, "node_tree", None) is not None:
+        hash_node_tree(digest, material.node_tree)
+
+
+def hash_node_tree(digest, node_tree, visited=None):
+    """Hash the nodes, their unconnected input values and the links of a node tree, including nested groups."""
+    visited = set() if visited is None else visited
+    if node_tree.name in visited:
+        return
+    visited.add(node_tree.name)
+
+    update_text(digest, node_tree.name)
+    for node in node_tree.nodes:
+        update_text(digest, node.bl_idname, node.name, *rna_values(node, exclude=NODE_LAYOUT_PROPERTIES))
+        for socket in node.inputs:
+            if not socket.is_linked and hasattr(socket, "default_value"):
+                update_text(digest, socket.identifier, str(rna_value(socket.default_value)))
+        # Images are stored by name, the file behind them is what ends up in the export
+        if getattr(node, "image", None) is not None:
+            update_text(digest, node.image.filepath)
+        if getattr(node, "node_tree", None) is not None:
+            hash_node_tree(digest, node.node_tree, visited)
+
+    for link in node_tree.links:
+        update_text(digest, link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+
+
+def hash_collection(digest, collection, attribute: str, size: int, typecode: str):
+    """Read one attribute of every item of a collection into a flat buffer and hash it."""
+    if typecode == "?":
+        # array has no bool typecode, booleans go through a plain list
+        values = [False] * (len(collection) * size)
+        collection.foreach_get(attribute, values)
+        digest.update(bytes(values))
+        return
+
+    buffer = array(typecode, [0]) * (len(collection) * size)
+    collection.foreach_get(attribute, buffer)
+    digest.update(buffer.tobytes())
+
+
+def update_floats(digest, values):
+    """Hash a sequence of floats."""
+    digest.update(array("d", values).tobytes())
+
+
+def update_text(digest, *values):
+    """Hash a sequence of strings."""
+    digest.update("\0".join(values).encode("utf-8"))
+    digest.update(b"\1")
+
+
+def rna_values(struct, exclude=()):
+    """Return the editable RNA properties of a struct as strings, e.g. the settings of a modifier."""
+    values = []
+    for prop in struct.bl_rna.properties:
+        if prop.is_readonly or prop.identifier == "rna_type" or prop.identifier in exclude:
+            continue
+        values.append(f"{prop.identifier}={rna_value(getattr(struct, prop.identifier, None))}")
+    return values
+
+
+def id_property_values(struct):
+    """Return the ID properties of a struct as strings, e.g. the inputs of a geometry nodes modifier."""
+    if not hasattr(struct, "keys"):
+        return []
+    return [f"{key}={rna_value(struct[key])}" for key in sorted(struct.keys())]
+
+
+def modifier_values(modifier):
+    """Return everything that configures a modifier: its RNA settings and its ID properties."""
+    return rna_values(modifier) + id_property_values(modifier)
+
+
+def rna_value(value):
+    """Turn an RNA or ID property value into something with a stable string form: IDs by name, arrays as tuples."""
+    if hasattr(value, "name"):
+        return value.name
+    if hasattr(value, "to_dict"):
+        return sorted(value.to_dict().items())
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(value)
+    return value
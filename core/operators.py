@@ -1,47 +1,222 @@
+import os
+
+import bpy
 from bpy.types import Operator
 
-from .exporters.obj_export import OBJ_Export
-from .exporters.fbx_export import FBX_Export
-from .exporters.stl_export import STL_Export
-from .exporters.gltf_export import GLTF_Export
-from .exporters.dae_export import DAE_Export
-from .exporters.abc_export import ABC_Export
+from .exporters import create_exporter
+from .parallel import run_parallel_export
+from .journal import ExportJournal, read_journal, repair_scene
+from .version_control.perforce_worker import get_worker
 
 
 class BBATCH_OT_ExportOperator(Operator):
     bl_idname = "object.bbatch_ot_operator"
     bl_label = "Batch Export"
-    bl_description = "export the selected objects"
+    bl_description = "export the selected objects, or the chosen collection"
     bl_options = {"REGISTER"}
 
+    _exporter = None
+    _timer = None
+    # CHECKOUT and SUBMIT wait for the Perforce worker, EXPORT writes one root per tick
+    _phase = None
+    _perforce_job = None
+    _cancelled = False
+
+    def create_exporter(self, context):
+        """Create the exporter for the formats chosen in the panel, or None when no known format is chosen."""
+        # export formats are registered to the scene as we dynamicly populate the enum based on the code exporters.
+        try:
+            return create_exporter(context, context.scene.export_file_formats)
+        except ValueError as e:
+            self.report({"ERROR"}, str(e))
+            return None
+
     def execute(self, context):
+        """Export everything in one blocking call, used when the operator is run from a script."""
         props = context.scene.panel_properties
+        exporter = self.create_exporter(context)
+        if exporter is None:
+            return {"CANCELLED"}
 
-        # export format is registered to the scene as we dynamicly populate the enum based on the code exporters.
-        export_format = context.scene.export_file_format
-
-        if export_format == ".obj":
-            exporter = OBJ_Export(context)
-        elif export_format == ".fbx":
-            exporter = FBX_Export(context)
-        elif export_format == ".stl":
-            exporter = STL_Export(context)
-        elif export_format == ".gltf":
-            exporter = GLTF_Export(context)
-        elif export_format == ".dae":
-            exporter = DAE_Export(context)
-        elif export_format == ".abc":
-            exporter = ABC_Export(context)
+        if use_parallel_export(context):
+            exporter.show_report = False
+            log_dir = run_parallel_export(exporter, props.worker_count)
+            exporter.report_results(extra_lines=[f"Worker logs: {log_dir}"])
         else:
-            self.report({"ERROR"}, "Unsupported export format: {}".format(export_format))
+            exporter.do_export()
+
+        self.report({"INFO"}, "Exported to: " + props.export_folder)
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        """Export one root per timer tick so Blender stays responsive; Esc cancels."""
+        props = context.scene.panel_properties
+        if use_parallel_export(context):
+            return self.execute(context)
+
+        exporter = self.create_exporter(context)
+        if exporter is None:
             return {"CANCELLED"}
 
-        exporter.do_export()
+        self._exporter = exporter
+        self._cancelled = False
+        exporter.prepare_export()
+        # Opening the files for edit waits on the server, it runs on the Perforce worker while the UI stays responsive
+        perforce_job = exporter.get_perforce_plan_job()
+        if perforce_job is not None:
+            self.submit_perforce("checkout", perforce_job)
+            self._phase = "CHECKOUT"
+        else:
+            exporter.start_export()
+            self._phase = "EXPORT"
+
+        wm = context.window_manager
+        wm.progress_begin(0, max(1, len(exporter.export_roots)))
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        self.update_status(context)
+        return {"RUNNING_MODAL"}
+
+    def submit_perforce(self, name: str, perforce_job):
+        """Run a Perforce job of the exporter on the worker, modal() picks up the finished job."""
+        self._perforce_job = None
+
+        def on_done(job):
+            self._perforce_job = job
+
+        get_worker().submit(name, perforce_job, on_done)
+
+    def modal(self, context, event):
+        # The files of a running Perforce job are in use, Esc only cancels while roots are being exported
+        if event.type == "ESC" and self._phase == "EXPORT":
+            return self.finish(context, cancelled=True)
+        if event.type != "TIMER":
+            # Keep the scene locked while roots are being exported
+            return {"RUNNING_MODAL"}
+
+        exporter = self._exporter
+        if self._phase == "EXPORT":
+            more = exporter.next_root_index < len(exporter.export_roots) and exporter.export_next(context)
+            self.update_status(context)
+            # Wait for the post-export threads without blocking the UI
+            if not more and not (exporter.post_export and exporter.post_export.pending()):
+                return self.finish(context, cancelled=False)
+            return {"RUNNING_MODAL"}
+
+        # Deliver the finished Perforce jobs here as well, the worker timer is not guaranteed to run between ticks
+        get_worker().deliver()
+        job = self._perforce_job
+        if job is None:
+            return {"RUNNING_MODAL"}
+        self._perforce_job = None
+
+        if self._phase == "CHECKOUT":
+            if job.error is not None:
+                self.report({"ERROR"}, f"Perforce checkout failed: {job.error}")
+                exporter.skip_remaining_roots(f"Checkout failed: {job.error}")
+            else:
+                exporter.apply_perforce_plan(*job.result)
+            exporter.start_export()
+            self._phase = "EXPORT"
+            context.window_manager.progress_begin(0, max(1, len(exporter.export_roots)))
+            self.update_status(context)
+            return {"RUNNING_MODAL"}
+
+        # SUBMIT
+        if job.error is not None:
+            self.report({"ERROR"}, f"Perforce could not add the exported files: {job.error}")
+        else:
+            exporter.apply_perforce_finish(job.result)
+        return self.complete(context)
+
+    def update_status(self, context):
+        """Show the progress in the progress bar and the status bar."""
+        exporter = self._exporter
+        if self._phase == "CHECKOUT":
+            context.workspace.status_text_set("BBatch: opening the files in Perforce")
+            return
+        if self._phase == "SUBMIT":
+            context.workspace.status_text_set("BBatch: adding the files to Perforce")
+            return
+
+        done = exporter.next_root_index
+        total = len(exporter.export_roots)
+        context.window_manager.progress_update(done)
+        pending = exporter.post_export.pending() if exporter.post_export else 0
+        if done >= total and pending:
+            context.workspace.status_text_set(f"BBatch: post-processing {pending} file(s)")
+        else:
+            context.workspace.status_text_set(f"BBatch: exported {done}/{total} objects, press Esc to cancel")
+
+    def finish(self, context, cancelled: bool):
+        """Restore the scene, then hand the written files to Perforce on the worker or complete right away."""
+        exporter = self._exporter
+        self._cancelled = cancelled
+        exporter.stop_export(cancelled=cancelled, context=context)
+
+        perforce_job = exporter.get_perforce_finish_job()
+        if perforce_job is None:
+            return self.complete(context)
+
+        self.submit_perforce("add", perforce_job)
+        self._phase = "SUBMIT"
+        self.update_status(context)
+        return {"RUNNING_MODAL"}
+
+    def complete(self, context):
+        """Stop the timer and report what was written."""
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+        exporter = self._exporter
+        self._exporter = None
+        self._phase = None
+        exporter.complete_export()
+
+        props = context.scene.panel_properties
+        if self._cancelled:
+            self.report({"WARNING"}, f"Export cancelled, {len(exporter.exported_files)} file(s) written to: {props.export_folder}")
+            return {"CANCELLED"}
 
         self.report({"INFO"}, "Exported to: " + props.export_folder)
         return {"FINISHED"}
 
 
+def use_parallel_export(context) -> bool:
+    """Parallel export needs several selected roots written to separate files, see run_parallel_export()."""
+    props = context.scene.panel_properties
+    return (
+        props.parallel_export
+        and props.export_source == "SELECTION"
+        and not props.single_file_export
+        and len(context.selected_objects) > 1
+    )
+
+
+class BBATCH_OT_RepairSceneOperator(Operator):
+    bl_idname = "object.bbatch_ot_repair_scene"
+    bl_label = "Repair Scene"
+    bl_description = "Restore the names and materials an interrupted export left behind, using the journal in the export folder"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        export_folder = os.path.abspath(bpy.path.abspath(context.scene.panel_properties.export_folder))
+        journal = ExportJournal(export_folder)
+
+        # Without a journal only the prefixed names and the scratch scenes can be repaired
+        repaired = repair_scene(read_journal(journal.filepath))
+        # The finished roots stay in the journal for a resume
+        journal.mark_repaired()
+
+        self.report(
+            {"INFO"},
+            "Repaired {names} name(s), {materials} mesh(es) and removed {scenes} scratch scene(s)".format(**repaired),
+        )
+        return {"FINISHED"}
+
+
 class BBATCH_OT_ToggleOptionsOperator(Operator):
     bl_idname = "object.bbatch_ot_toggle_options"
     bl_label = "Toggle Options"
@@ -21,10 +21,19 @@ class BBATCH_PT_MainPanel(Panel):
         row = box.row()
         row.prop(props, "export_folder", text="")
 
-        # File format dropdown
-        row = layout.row()
-        row.label(text="File Format:", icon="FILE_BLEND")
-        row.prop(context.scene, "export_file_format", text="")
+        # Export source, the selection or a collection mapped to files
+        layout.row(align=True).prop(props, "export_source", expand=True)
+        if props.export_source == "COLLECTION":
+            col = layout.box().column(align=True)
+            col.prop(props, "export_collection", text="")
+            col.prop(props, "export_child_collections", icon="OUTLINER_COLLECTION")
+            col.prop(props, "collection_naming")
+            col.prop(props, "collection_subfolder")
+
+        # File format toggles, every enabled format is written from the same preparation pass
+        layout.label(text="File Formats:", icon="FILE_BLEND")
+        row = layout.row(align=True)
+        row.prop(context.scene, "export_file_formats")
 
         # Options toggle button
         row = layout.row(align=True)
@@ -40,11 +49,49 @@ class BBATCH_PT_MainPanel(Panel):
 
             box.prop(props, "center_transform", text="Center Transform", icon="EMPTY_ARROWS")
             box.prop(props, "one_material_ID", text="Single Material ID", icon="MATERIAL")
+            box.prop(props, "incremental_export", text="Incremental Export", icon="FILE_REFRESH")
+            box.prop(props, "non_destructive", text="Non-Destructive Export", icon="DUPLICATE")
+            box.prop(props, "deduplicate_instances", text="Deduplicate Instances", icon="LINKED")
+
+            if {".gltf", ".glb"} & context.scene.export_file_formats and props.export_source == "SELECTION":
+                row = box.row(align=True)
+                row.prop(props, "single_file_export", text="Single File", icon="FILE")
+                sub = row.row(align=True)
+                sub.enabled = props.single_file_export
+                sub.prop(props, "single_file_name", text="")
+
+            row = box.row(align=True)
+            row.prop(props, "parallel_export", text="Parallel Export", icon="SYSTEM")
+            sub = row.row(align=True)
+            sub.enabled = props.parallel_export
+            sub.prop(props, "worker_count", text="Workers")
+
+            col = box.column(align=True)
+            col.label(text="Post-Export:", icon="MODIFIER")
+            col.row(align=True).prop(props, "post_export_stages")
+            if props.post_export_stages:
+                col.prop(props, "post_export_workers")
+            if "COMPRESS" in props.post_export_stages:
+                col.prop(props, "post_export_compression")
+            if "MIRROR" in props.post_export_stages:
+                col.prop(props, "post_export_mirror_folder", text="Mirror")
+
+            row = box.row(align=True)
+            row.prop(props, "resume_export", text="Resume", icon="RECOVER_LAST")
+            row.operator("object.bbatch_ot_repair_scene", text="Repair Scene", icon="TOOL_SETTINGS")
+
+            box.prop(props, "profile_export", text="Profile Export", icon="TIME")
+            if props.profile_export:
+                box.prop(props, "trace_file", text="Trace")
 
             row = box.row()
             row.label(text="Smoothing:", icon="MOD_SMOOTH")
             row.prop(props, "export_smoothing", text="")
 
+            row = box.row()
+            row.label(text="Name Isolation:", icon="SORTALPHA")
+            row.prop(props, "name_isolation", text="")
+
         # Export button
         layout.separator()
         layout.operator("object.bbatch_ot_operator", text="Export", icon="EXPORT")
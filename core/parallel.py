@@ -0,0 +1,163 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import logging
+
+import bpy
+
+from .profiling import ExportProfiler
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Name of the addon package, workers enable it before importing this module
+ADDON_PACKAGE = __package__.rsplit(".", 1)[0]
+
+
+def split_into_shards(items, count: int):
+    """Split the items into at most `count` shards of similar size."""
+    count = max(1, min(count, len(items)))
+    return [items[index::count] for index in range(count)]
+
+
+def run_parallel_export(exporter, worker_count: int):
+    """
+    Export the roots of the exporter across a pool of headless Blender workers.
+    The parent plans the batch (incremental skips, Perforce checkout), saves a copy of the .blend, starts one
+    `blender -b` worker per shard and merges the results and skip reasons back into the exporter.
+    Returns the folder holding the worker logs.
+    """
+    # Workers rebuild their exporter from the root names, so they would write one file per root instead of the
+    # collection units planned here. use_parallel_export() keeps collection mode out of the parallel path.
+    assert not exporter.uses_collection_units, "Collection units cannot be exported by parallel workers"
+
+    with exporter.profiler.span("plan"):
+        export_roots = exporter.plan_export()
+    job_dir = tempfile.mkdtemp(prefix="bbatch_")
+    if not export_roots:
+        return job_dir
+    exporter.open_journal()
+
+    blend_copy = os.path.join(job_dir, "scene.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=blend_copy, copy=True)
+
+    workers = []
+    try:
+        for index, shard in enumerate(split_into_shards(export_roots, worker_count)):
+            job = {
+                "formats": [format_exporter.export_format for format_exporter in exporter.format_exporters],
+                "export_folder": exporter.export_folder,
+                "roots": [root_obj.name for root_obj in shard],
+                "result": os.path.join(job_dir, f"worker_{index}.json"),
+            }
+            job_path = os.path.join(job_dir, f"worker_{index}_job.json")
+            with open(job_path, "w", encoding="utf-8") as f:
+                json.dump(job, f)
+
+            log_path = os.path.join(job_dir, f"worker_{index}.log")
+            log = open(log_path, "w", encoding="utf-8")
+            try:
+                process = subprocess.Popen(worker_command(blend_copy, job_path), stdout=log, stderr=subprocess.STDOUT)
+            except BaseException:
+                log.close()
+                raise
+            workers.append((index, process, log, job))
+    except BaseException:
+        # A worker that could not be started fails the whole run, do not leave the others writing files behind it
+        stop_workers(workers)
+        raise
+
+    for index, process, log, job in workers:
+        with exporter.profiler.span(f"worker {index}"):
+            returncode = process.wait()
+        log.close()
+        merge_worker_result(exporter, index, returncode, job)
+
+    # Only roots with every file written count as done for a resumed run, synced once for all of them
+    exported_files = set(exporter.exported_files)
+    for root_obj in export_roots:
+        if all(path in exported_files for path in exporter.export_filepaths[root_obj]):
+            exporter.record_done([root_obj], sync=False)
+    exporter.journal.sync()
+
+    os.remove(blend_copy)
+
+    # The workers only write files, the post-export steps run here on the merged result
+    exporter.start_post_export()
+    exporter.submit_post_export(exporter.exported_files)
+    exporter.drain_post_export()
+    exporter.finish_exported_files()
+    exporter.journal.close()
+    exporter.finish_profiling()
+    return job_dir
+
+
+def stop_workers(workers):
+    """Kill the started workers, wait for them to exit and close their logs."""
+    for index, process, log, job in workers:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        log.close()
+
+
+def worker_command(blend_path: str, job_path: str) -> list:
+    """Return the command line that runs one export worker."""
+    expr = (
+        "import addon_utils; "
+        f"addon_utils.enable({ADDON_PACKAGE!r}, default_set=True); "
+        f"import {__name__} as bbatch_parallel; "
+        "bbatch_parallel.worker_main()"
+    )
+    return [bpy.app.binary_path, "-b", blend_path, "--python-expr", expr, "--", job_path]
+
+
+def merge_worker_result(exporter, index: int, returncode: int, job: dict):
+    """Merge the result file of a worker into the exporter, failing its whole shard if it has none."""
+    try:
+        with open(job["result"], "r", encoding="utf-8") as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        logger.error(f"Export worker {index} exited with code {returncode} without a result.")
+        for name in job["roots"]:
+            exporter.skipped_exports.append((name, f"Worker {index} failed, see worker_{index}.log"))
+        return
+
+    exporter.exported_files.extend(result["exported"])
+    exporter.skipped_exports.extend(tuple(skipped) for skipped in result["skipped"])
+
+
+def worker_main():
+    """Entry point of a headless worker: export the roots listed in the job file passed after `--`."""
+    from .exporters import create_exporter
+
+    job_path = sys.argv[sys.argv.index("--") + 1]
+    with open(job_path, "r", encoding="utf-8") as f:
+        job = json.load(f)
+
+    export_objects = [bpy.data.objects[name] for name in job["roots"] if name in bpy.data.objects]
+
+    # Perforce, the manifest and profiling are handled by the parent, the worker only writes files.
+    # A profiling worker would also overwrite the trace file of the parent.
+    exporter = create_exporter(
+        bpy.context,
+        job["formats"],
+        export_objects=export_objects,
+        export_folder=job["export_folder"],
+        use_perforce=False,
+        incremental_export=False,
+        show_report=False,
+        profiler=ExportProfiler(enabled=False),
+        post_export_stages=(),
+        instance_manifest=False,
+        use_journal=False,
+    )
+    exporter.do_export()
+
+    missing = [(name, "Object not found in worker") for name in job["roots"] if name not in bpy.data.objects]
+    with open(job["result"], "w", encoding="utf-8") as f:
+        json.dump({"exported": exporter.exported_files, "skipped": exporter.skipped_exports + missing}, f)
+
+    print(f"BBatch worker exported {len(exporter.exported_files)} file(s), skipped {len(exporter.skipped_exports) + len(missing)}.")
@@ -0,0 +1,148 @@
+import os
+import gzip
+import lzma
+import queue
+import shutil
+import hashlib
+import threading
+import logging
+
+from .profiling import ExportProfiler
+from .manifest import relative_export_path
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Stages a pipeline can run on every exported file, in this order
+STAGES = ("HASH", "COMPRESS", "MIRROR", "PERFORCE")
+
+COMPRESSION_SUFFIXES = {"GZIP": ".gz", "LZMA": ".xz"}
+
+CHUNK_SIZE = 1024 * 1024
+
+# Queue item telling a worker to stop
+_STOP = object()
+
+
+class PostExportPipeline:
+    """
+    Post-processes exported files on a small thread pool while the main thread exports the next root.
+    Files go through a bounded queue, so submit() blocks when the workers fall behind instead of piling up work.
+    The stages only read the exported files and never touch bpy data, so they are safe to run off the main thread.
+    """
+
+    def __init__(
+        self,
+        stages,
+        worker_count: int = 2,
+        queue_size: int = 8,
+        compression: str = "GZIP",
+        mirror_folder: str = "",
+        export_folder: str = "",
+        perforce_manager=None,
+        changelist: str = None,
+        profiler: ExportProfiler = None,
+    ):
+        self.stages = set(stages)
+        self.compression = compression
+        self.mirror_folder = mirror_folder
+        # Files are mirrored to the same sub-folder they have in the export folder
+        self.export_folder = export_folder
+        self.perforce_manager = perforce_manager
+        self.changelist = changelist
+        self.profiler = profiler or ExportProfiler()
+        self.results = {}
+        self.errors = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._workers = []
+        for index in range(max(1, worker_count)):
+            worker = threading.Thread(target=self._work, name=f"bbatch_post_export_{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, filepath: str, add_to_perforce: bool = False):
+        """Queue an exported file, blocking while the queue is full."""
+        self._queue.put((filepath, add_to_perforce))
+
+    def pending(self) -> int:
+        """Return the number of queued files that are not processed yet."""
+        return self._queue.unfinished_tasks
+
+    def drain(self) -> dict:
+        """Wait for every queued file, stop the workers and return the results by path."""
+        for _worker in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        return self.results
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                filepath, add_to_perforce = item
+                try:
+                    result = self.process(filepath, add_to_perforce)
+                except Exception as e:
+                    logger.error(f"Post-export of '{filepath}' failed: {e}")
+                    with self._lock:
+                        self.errors.append((filepath, f"{type(e).__name__}: {e}"))
+                else:
+                    with self._lock:
+                        self.results[filepath] = result
+            finally:
+                self._queue.task_done()
+
+    def process(self, filepath: str, add_to_perforce: bool) -> dict:
+        """Run the enabled stages on one file and return what they produced."""
+        name = os.path.basename(filepath)
+        result = {}
+        outputs = [filepath]
+
+        if "HASH" in self.stages:
+            with self.profiler.span("post hash", name):
+                digest = hash_file(filepath)
+                hash_path = filepath + ".sha256"
+                with open(hash_path, "w", encoding="utf-8") as f:
+                    f.write(f"{digest} *{name}\n")
+            result["sha256"] = digest
+            outputs.append(hash_path)
+
+        if "COMPRESS" in self.stages:
+            with self.profiler.span("post compress", name):
+                archive_path = compress_file(filepath, self.compression)
+            result["archive"] = archive_path
+            outputs.append(archive_path)
+
+        if "MIRROR" in self.stages and self.mirror_folder:
+            with self.profiler.span("post mirror", name):
+                mirror_folder = os.path.join(self.mirror_folder, os.path.dirname(relative_export_path(filepath, self.export_folder)))
+                os.makedirs(mirror_folder, exist_ok=True)
+                result["mirror"] = [shutil.copy2(path, os.path.join(mirror_folder, os.path.basename(path))) for path in outputs]
+
+        if "PERFORCE" in self.stages and add_to_perforce and self.perforce_manager is not None:
+            result["perforce_added"] = self.perforce_manager.add_files([filepath], changelist=self.changelist)
+
+        return result
+
+
+def hash_file(filepath: str) -> str:
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compress_file(filepath: str, compression: str = "GZIP") -> str:
+    """Write a gzip or lzma archive next to the file and return its path."""
+    archive_path = filepath + COMPRESSION_SUFFIXES[compression]
+    opener = gzip.open if compression == "GZIP" else lzma.open
+    with open(filepath, "rb") as source, opener(archive_path, "wb") as target:
+        shutil.copyfileobj(source, target, CHUNK_SIZE)
+    return archive_path
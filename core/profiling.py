@@ -0,0 +1,84 @@
+import os
+import json
+import time
+import threading
+import logging
+from contextlib import nullcontext
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Shared no-op span handed out while profiling is disabled
+_NULL_SPAN = nullcontext()
+
+
+class ExportProfiler:
+    """
+    Collects named timing spans per root and per phase of an export run.
+    While disabled, span() returns a shared no-op context manager, so instrumented code pays one call per span.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.spans = []
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, root: str = None):
+        """Time the enclosed block as `name`, optionally attributed to an exported root."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, root)
+
+    def summary(self):
+        """Return (phase, total seconds, count) tuples, slowest phase first."""
+        totals = {}
+        for name, _root, _start, duration, _thread in self.spans:
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + duration, count + 1)
+        return sorted(((name, total, count) for name, (total, count) in totals.items()), key=lambda item: item[1], reverse=True)
+
+    def summary_lines(self, limit: int = 10):
+        """Return the summary as short text lines for the report popup and the console."""
+        return [f"{name}: {total:.3f}s ({count}x)" for name, total, count in self.summary()[:limit]]
+
+    def write_chrome_trace(self, filepath: str):
+        """Write the spans in the Chrome trace event format (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        events = []
+        for name, root, start, duration, thread in self.spans:
+            event = {
+                "name": name,
+                "cat": "bbatch",
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": thread,
+            }
+            if root is not None:
+                event["args"] = {"root": root}
+            events.append(event)
+
+        try:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            logger.error(f"Could not write export trace '{filepath}': {e}")
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "root", "start")
+
+    def __init__(self, profiler, name, root):
+        self.profiler = profiler
+        self.name = name
+        self.root = root
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        self.profiler.spans.append((self.name, self.root, self.start, duration, threading.get_ident()))
+        return False
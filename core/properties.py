@@ -1,7 +1,7 @@
 # settings.py
 
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty, PointerProperty
 from bpy.types import PropertyGroup
 
 
@@ -13,6 +13,40 @@ class BBatch_PanelProperties(PropertyGroup):
         default=".\\",
     )
 
+    export_source: EnumProperty(
+        name="Export",
+        description="What the export goes through",
+        items=(
+            ("SELECTION", "Selection", "Export every selected object and its children into its own file", 0),
+            ("COLLECTION", "Collection", "Export a collection, or each of its child collections, into one file, whatever is selected", 1),
+        ),
+        default="SELECTION",
+    )
+
+    export_collection: PointerProperty(
+        name="Collection",
+        description="Collection exported in collection mode",
+        type=bpy.types.Collection,
+    )
+
+    export_child_collections: BoolProperty(
+        name="Child Collections",
+        description="Write every child collection into its own file instead of the whole collection into one",
+        default=False,
+    )
+
+    collection_naming: StringProperty(
+        name="File Name",
+        description="Name of the file of every collection, without extension. {collection}, {parent} and {blend} are replaced by the collection, its parent collection and the .blend file name",
+        default="{collection}",
+    )
+
+    collection_subfolder: StringProperty(
+        name="Sub-Folder",
+        description="Optional folder inside the export folder the collection files go to, takes the same tokens as the file name",
+        default="",
+    )
+
     center_transform: BoolProperty(
         name="Center Transform",
         description="Move the object back to world origins (0,0,0) before exporting it.",
@@ -48,6 +82,117 @@ class BBatch_PanelProperties(PropertyGroup):
         default=False,
     )
 
+    name_isolation: EnumProperty(
+        name="Name Isolation",
+        description="Which objects are temporarily renamed so the export objects can drop their .xxx suffix",
+        items=(
+            ("COLLISIONS", "Collisions Only", "Only rename objects whose name collides with a stripped export name", 0),
+            ("ALL", "All Objects", "Rename every non-export object for each exported asset", 1),
+        ),
+        default="COLLISIONS",
+    )
+
+    incremental_export: BoolProperty(
+        name="Incremental Export",
+        description="Skip objects whose content and output file did not change since the last export",
+        default=False,
+    )
+
+    non_destructive: BoolProperty(
+        name="Non-Destructive Export",
+        description="Export temporary copies built from the evaluated objects instead of modifying the scene",
+        default=False,
+    )
+
+    deduplicate_instances: BoolProperty(
+        name="Deduplicate Instances",
+        description="Export objects sharing a mesh, modifiers and materials once and write their placements to bbatch_instances.json",
+        default=False,
+    )
+
+    single_file_export: BoolProperty(
+        name="Single File",
+        description="Write all selected objects as named nodes into one file with shared meshes and materials (glTF only)",
+        default=False,
+    )
+
+    single_file_name: StringProperty(
+        name="File Name",
+        description="Name of the file written in single file mode, without extension",
+        default="scene",
+    )
+
+    resume_export: BoolProperty(
+        name="Resume Interrupted Export",
+        description="Skip the objects an interrupted or cancelled export of this file already wrote, according to its journal",
+        default=False,
+    )
+
+    parallel_export: BoolProperty(
+        name="Parallel Export",
+        description="Split the selection into shards and export them in background Blender processes",
+        default=False,
+    )
+
+    worker_count: IntProperty(
+        name="Workers",
+        description="Number of background Blender processes used for a parallel export",
+        default=4,
+        min=1,
+        max=64,
+    )
+
+    post_export_stages: EnumProperty(
+        name="Post-Export",
+        description="Steps run on every exported file in background threads while the next object is exported",
+        items=(
+            ("HASH", "Hash", "Write a .sha256 file next to every exported file", 1),
+            ("COMPRESS", "Compress", "Write a compressed archive next to every exported file", 2),
+            ("MIRROR", "Mirror", "Copy the exported files to the mirror folder", 4),
+            ("PERFORCE", "P4 Add", "Mark new files for add as soon as they are written", 8),
+        ),
+        options={"ENUM_FLAG"},
+        default=set(),
+    )
+
+    post_export_compression: EnumProperty(
+        name="Compression",
+        description="Archive format of the compress step",
+        items=(
+            ("GZIP", "gzip", "Fast, writes .gz archives", 0),
+            ("LZMA", "lzma", "Smaller but slower, writes .xz archives", 1),
+        ),
+        default="GZIP",
+    )
+
+    post_export_mirror_folder: StringProperty(
+        name="Mirror Folder",
+        subtype="DIR_PATH",
+        description="Staging folder the mirror step copies the exported files to",
+        default="",
+    )
+
+    post_export_workers: IntProperty(
+        name="Threads",
+        description="Number of threads running the post-export steps",
+        default=2,
+        min=1,
+        max=16,
+    )
+
+    profile_export: BoolProperty(
+        name="Profile Export",
+        description="Time every phase of the export and show a summary afterwards",
+        default=False,
+    )
+
+    trace_file: StringProperty(
+        name="Trace File",
+        subtype="FILE_PATH",
+        description="Optional JSON file to write the timings to, in the Chrome trace format",
+        default="",
+    )
+
     @classmethod
     def register(cls):
         bpy.types.Scene.panel_properties = bpy.props.PointerProperty(type=cls)
@@ -0,0 +1,144 @@
+import bpy
+from array import array
+from contextlib import contextmanager
+
+
+class ScratchScene:
+    """
+    Temporary scene holding lightweight copies of the objects to export.
+    Transforms and material overrides are applied to the copies, optionally on meshes baked from the evaluated
+    objects, while the user's objects stay untouched.
+    """
+
+    def __init__(self, source_scene, name="%BBatch%_Scratch"):
+        self.scene = bpy.data.scenes.new(name)
+        # Animated exports bake the frame range at the frame rate of the source scene, starting from its current frame
+        self.scene.frame_start = source_scene.frame_start
+        self.scene.frame_end = source_scene.frame_end
+        self.scene.frame_current = source_scene.frame_current
+        self.scene.render.fps = source_scene.render.fps
+        self.scene.render.fps_base = source_scene.render.fps_base
+        self.scene.unit_settings.system = source_scene.unit_settings.system
+        self.scene.unit_settings.scale_length = source_scene.unit_settings.scale_length
+        self.copies = {}
+        self.meshes = []
+
+    @property
+    def view_layer(self):
+        return self.scene.view_layers[0]
+
+    def add_objects(self, objects, names: dict, apply_modifiers=True, single_material_objects=()):
+        """
+        Link a copy of every object into the scratch scene and return the originals -> copies map.
+        `names` maps the originals to the names their copies should get; they must be free.
+        With `apply_modifiers` disabled the copies keep their modifiers and share the original mesh,
+        which is needed to export armature deformation and animation.
+        The copies of `single_material_objects` are reduced to their last material.
+        """
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        # Objects without modifiers evaluate to their mesh, linked duplicates keep sharing one baked mesh
+        baked_meshes = {}
+
+        for obj in objects:
+            copy = obj.copy()
+            if obj.type == "MESH":
+                single_material = obj in single_material_objects
+                if apply_modifiers:
+                    mesh = baked_meshes.get((obj.data, single_material)) if not obj.modifiers else None
+                    if mesh is None:
+                        mesh = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+                        self.meshes.append(mesh)
+                        if not obj.modifiers:
+                            baked_meshes[obj.data, single_material] = mesh
+                        if single_material:
+                            collapse_materials(mesh)
+                    copy.modifiers.clear()
+                    copy.data = mesh
+                elif single_material:
+                    # Linked duplicates keep sharing one collapsed copy of their mesh
+                    mesh = baked_meshes.get((obj.data, single_material))
+                    if mesh is None:
+                        mesh = baked_meshes[obj.data, single_material] = obj.data.copy()
+                        self.meshes.append(mesh)
+                        collapse_materials(mesh)
+                    copy.data = mesh
+
+            copy.name = names.get(obj, obj.name)
+            self.scene.collection.objects.link(copy)
+            self.copies[obj] = copy
+
+        for obj, copy in self.copies.items():
+            if obj.parent in self.copies:
+                # The copy keeps its parent inverse and local transform, so its world transform is unchanged
+                copy.parent = self.copies[obj.parent]
+            else:
+                copy.parent = None
+                copy.matrix_world = obj.matrix_world.copy()
+
+            for modifier in copy.modifiers:
+                target = getattr(modifier, "object", None)
+                if target in self.copies:
+                    modifier.object = self.copies[target]
+
+        return self.copies
+
+    def select_copies(self):
+        """Select the copies in the scratch view layer and make the first one active."""
+        view_layer = self.view_layer
+        for copy in self.copies.values():
+            copy.select_set(True, view_layer=view_layer)
+        if self.copies:
+            view_layer.objects.active = next(iter(self.copies.values()))
+
+    def clear(self):
+        """Remove the copies and their meshes."""
+        for copy in self.copies.values():
+            bpy.data.objects.remove(copy, do_unlink=True)
+        for mesh in self.meshes:
+            if mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+        self.copies.clear()
+        self.meshes.clear()
+
+    def remove(self):
+        """Remove the copies and the scratch scene itself."""
+        self.clear()
+        bpy.data.scenes.remove(self.scene)
+
+
+def collapse_materials(mesh):
+    """Reduce the mesh to its last material and point every face at it."""
+    materials = list(mesh.materials)
+    if len(materials) <= 1:
+        return False
+
+    mesh.materials.clear()
+    mesh.materials.append(materials[-1])
+    mesh.polygons.foreach_set("material_index", array("i", [0]) * len(mesh.polygons))
+    mesh.update()
+    return True
+
+
+@contextmanager
+def scene_override(context, scene, view_layer):
+    """
+    Run the export operators against another scene than the one shown in the window.
+    The FBX, OBJ and Collada exporters read the selection from the window's view layer rather than the context,
+    so the window is switched to the scene as well, overriding the context alone would export the originals.
+    """
+    window = context.window
+    if window is not None:
+        original_scene, original_view_layer = window.scene, window.view_layer
+        window.scene = scene
+        window.view_layer = view_layer
+    try:
+        if hasattr(context, "temp_override"):
+            with context.temp_override(window=window, scene=scene, view_layer=view_layer):
+                yield
+        else:
+            # Blender < 3.2 has no temp_override, the switched window is all the operators see
+            yield
+    finally:
+        if window is not None:
+            window.scene = original_scene
+            window.view_layer = original_view_layer
@@ -16,17 +16,76 @@ def set_object_to_loc(obj, loc):
     print(f"Set location of '{obj.name}' to {loc}.")
 
 
-def get_children(obj):
+def get_children(obj, index=None):
     """Recursively retrieve all children of the specified object."""
     if obj is None:
         raise ValueError("Provided parent object is None.")
 
-    children = []
-    for ob in bpy.data.objects:
-        if ob.parent == obj:
-            children.append(ob)
-            children.extend(get_children(ob))
-    return children
+    if index is None:
+        index = HierarchyIndex()
+    return index.get_descendants(obj)
+
+
+class HierarchyIndex:
+    """
+    Parent -> children map of bpy.data.objects, built once and reused for every lookup.
+    Descendant lists are cached per root. The parent of every object is recorded when the map is
+    built and compared on each lookup, the index rebuilds itself as soon as an object was added,
+    removed or reparented.
+    """
+
+    def __init__(self):
+        self.__children = {}
+        self.__descendants = {}
+        self.__parents = None
+
+    def invalidate(self):
+        """Drop the index so it is rebuilt on the next lookup."""
+        self.__children.clear()
+        self.__descendants.clear()
+        self.__parents = None
+
+    def rebuild(self):
+        """Build the parent -> children map in a single pass over all objects."""
+        self.invalidate()
+        self.__parents = self.snapshot_parents()
+        for ob, parent in self.__parents.items():
+            if parent is not None:
+                self.__children.setdefault(parent, []).append(ob)
+
+    @staticmethod
+    def snapshot_parents() -> dict:
+        """Return the parent of every object in the file."""
+        return {ob: ob.parent for ob in bpy.data.objects}
+
+    def is_stale(self) -> bool:
+        """Return True when objects were added, removed or reparented since the last build."""
+        return self.__parents is None or self.__parents != self.snapshot_parents()
+
+    def get_children(self, obj):
+        """Return the direct children of the object."""
+        if self.is_stale():
+            self.rebuild()
+        return list(self.__children.get(obj, ()))
+
+    def get_descendants(self, obj):
+        """Return all descendants of the object in depth-first order."""
+        if self.is_stale():
+            self.rebuild()
+
+        cached = self.__descendants.get(obj)
+        if cached is not None:
+            return list(cached)
+
+        descendants = []
+        stack = list(reversed(self.__children.get(obj, ())))
+        while stack:
+            ob = stack.pop()
+            descendants.append(ob)
+            stack.extend(reversed(self.__children.get(ob, ())))
+
+        self.__descendants[obj] = descendants
+        return list(descendants)
 
 
 def get_cursor_loc(context):
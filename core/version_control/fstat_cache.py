@@ -0,0 +1,127 @@
+import os
+import json
+import stat
+import time
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = "p4_fstat_cache.json"
+
+DEFAULT_TTL = 60 * 60
+
+CACHE_VERSION = 2
+
+
+def get_default_cache_path() -> str:
+    """
+    Return where the cache is kept: the BBatch folder of Blender's user config, which survives addon updates and
+    is writable when the addon is installed in a read-only location. It is safe to delete at any time.
+    """
+    # Imported here so the cache can be used and tested outside Blender with an explicit path
+    import bpy
+
+    return os.path.join(bpy.utils.user_resource("CONFIG", path="BBatch", create=True), CACHE_NAME)
+
+
+class FstatCache:
+    """
+    Persistent cache of `p4 fstat` results, keyed by client and local path.
+    An entry is only used while it is younger than the TTL and the local file still has the size, mtime and
+    writable bit it had when the entry was stored, so files changed outside BBatch are asked to the server again.
+    Submitting or reverting a file outside BBatch makes it read-only without touching its content.
+    """
+
+    def __init__(self, filepath: str = None, ttl: float = DEFAULT_TTL):
+        self.filepath = filepath or get_default_cache_path()
+        self.ttl = ttl
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read the cache, dropping the expired entries."""
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+
+        now = time.time()
+        self.entries = {key: entry for key, entry in data.get("entries", {}).items() if now - entry.get("time", 0) < self.ttl}
+
+    def save(self):
+        """Write the cache if anything changed."""
+        with self._lock:
+            if not self.dirty:
+                return
+            entries = dict(self.entries)
+            self.dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+            with open(self.filepath, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f)
+        except OSError as e:
+            logger.warning(f"Could not write the Perforce fstat cache '{self.filepath}': {e}")
+
+    def get(self, client: str, path: str):
+        """Return the cached entry of a path, or None when it is missing, expired or the file changed on disk."""
+        if self.ttl <= 0:
+            return None
+        entry = self.entries.get(cache_key(client, path))
+        if entry is None or time.time() - entry["time"] >= self.ttl:
+            return None
+        if entry["stat"] != file_stat(path):
+            return None
+        return entry
+
+    def put(self, client: str, path: str, status: str, depot_file: str = None, head_rev: str = None):
+        """Store the Perforce state of a path together with the current state of the file on disk."""
+        with self._lock:
+            self.entries[cache_key(client, path)] = {
+                "status": status,
+                "depot_file": depot_file,
+                "head_rev": head_rev,
+                "stat": file_stat(path),
+                "time": time.time(),
+            }
+            self.dirty = True
+
+    def mark_opened(self, client: str, paths, status: str = "OPENED"):
+        """Record that BBatch opened the paths itself, e.g. after `p4 edit` or `p4 add`."""
+        for path in paths:
+            entry = self.entries.get(cache_key(client, path), {})
+            self.put(client, path, status, entry.get("depot_file"), entry.get("head_rev"))
+
+    def touch(self, client: str, paths):
+        """Refresh the file state of opened paths BBatch just wrote, their Perforce state did not change."""
+        for path in paths:
+            entry = self.entries.get(cache_key(client, path))
+            if entry is not None and entry["status"].startswith("OPENED"):
+                self.put(client, path, entry["status"], entry.get("depot_file"), entry.get("head_rev"))
+
+    def invalidate(self, client: str, paths):
+        """Forget the paths, e.g. after BBatch submitted or reverted them."""
+        with self._lock:
+            for path in paths:
+                if self.entries.pop(cache_key(client, path), None) is not None:
+                    self.dirty = True
+
+
+def cache_key(client: str, path: str) -> str:
+    return f"{client or ''}|{path}"
+
+
+def file_stat(path: str):
+    """Return [size, mtime_ns, writable] of a local file, or None when it does not exist."""
+    try:
+        result = os.stat(path)
+    except OSError:
+        return None
+    return [result.st_size, result.st_mtime_ns, bool(result.st_mode & stat.S_IWUSR)]
@@ -1,37 +1,41 @@
-import subprocess
+from .perforce_session import PerforceError, get_session, errors
 
 
 def connect_to_perforce(server, user, client, password=None):
     """
     Establishes a connection to the Perforce server using the given credentials.
-    Sets up environment variables and logs into the Perforce server.
+    Configures the shared session and logs into the Perforce server.
     """
-    # Set environment variables for Perforce
-    subprocess.run(["p4", "set", f"P4PORT={server}"])
-    subprocess.run(["p4", "set", f"P4USER={user}"])
-    subprocess.run(["p4", "set", f"P4CLIENT={client}"])
+    session = get_session()
+    session.configure(server, user, client)
 
     # Attempt to log in to Perforce
-    if password:
-        login_process = subprocess.run(["p4", "login"], input=password.encode(), capture_output=True, text=True)
-    else:
-        login_process = subprocess.run(["p4", "login", "-s"], capture_output=True, text=True)
-
-    # Check if the login was successful
-    if login_process.returncode == 0:
+    if session.login(password):
         print("Perforce login successful.")
         return True
     else:
-        print(f"Perforce login failed: {login_process.stderr}")
+        print("Perforce login failed.")
         return False
 
 
+def test_connection(session, password=None) -> str:
+    """
+    Log in and ask the server for `p4 info`, meant to run on the Perforce worker thread.
+    Returns a short description of the connection, raises PerforceError when it fails.
+    """
+    if not session.login(password):
+        raise PerforceError("Perforce login failed")
+
+    info = session.info()
+    return f"Connected to {info.get('serverAddress', session.server or '?')} as {info.get('userName', session.user or '?')}"
+
+
 def checkout_file(filepath):
     """
     Checks out a file in Perforce to make it writable.
     """
-    result = subprocess.run(["p4", "edit", filepath], capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error checking out file: {result.stderr}")
+    failed = errors(get_session().run("edit", filepath))
+    if failed:
+        print(f"Error checking out file: {failed[0]}")
     else:
         print(f"File checked out: {filepath}")
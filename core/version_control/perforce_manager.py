@@ -1,7 +1,10 @@
-import subprocess
 import os
+import re
 import logging
 
+from .perforce_session import PerforceError, get_session, errors
+from ..profiling import ExportProfiler
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -9,40 +12,289 @@ logger = logging.getLogger(__name__)
 class PerforceManager:
     """Handles interactions with the Perforce version control system."""
 
+    def __init__(self, session=None, profiler=None, cache=None):
+        self.session = session or get_session()
+        self.profiler = profiler or ExportProfiler()
+        # Optional FstatCache, lets repeated exports skip fstat for files they already opened
+        self.cache = cache
+        self._cache_client = None  # (configured client, resolved workspace name)
+
     def check_connection(self) -> bool:
         """Check if there is a valid connection to the Perforce server."""
         try:
-            result = subprocess.run(["p4", "info"], capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info("Connected to Perforce server.")
-                return True
-            logger.error(f"Perforce connection failed: {result.stderr}")
-            return False
-        except Exception as e:
-            logger.error(f"Error connecting to Perforce: {e}")
+            self.session.info()
+            logger.info("Connected to Perforce server.")
+            return True
+        except PerforceError as e:
+            logger.error(f"Perforce connection failed: {e}")
             return False
 
+    def get_cache_client(self):
+        """
+        Return the workspace the fstat cache entries are keyed by, or None when the cache cannot be used.
+        A session without a configured client uses the one of the p4 environment, its name is asked to the server
+        once, so entries of different workspaces never mix.
+        """
+        if self.cache is None:
+            return None
+        if self._cache_client is None or self._cache_client[0] != self.session.client:
+            client = self.session.client
+            if not client:
+                try:
+                    client = self.session.info().get("clientName")
+                except PerforceError as e:
+                    logger.warning(f"Not using the Perforce fstat cache, the workspace is unknown: {e}")
+            if client == "*unknown*":
+                client = None
+            self._cache_client = (self.session.client, client)
+        return self._cache_client[1]
+
     def file_exists(self, filepath: str) -> bool:
         """Check if the file already exists in the export folder."""
         return os.path.isfile(filepath)
 
     def is_file_checked_in(self, filepath: str) -> bool:
         """Check if the file is checked into Perforce."""
+        if self.get_cache_client() is not None:
+            return self.get_file_statuses([filepath])[normalize_path(filepath)] != "NEW"
+
         try:
-            result = subprocess.run(["p4", "fstat", filepath], capture_output=True, text=True)
-            return result.returncode == 0 and "depotFile" in result.stdout
-        except Exception as e:
+            records = self.session.run("fstat", filepath)
+        except PerforceError as e:
             logger.error(f"Error checking file status in Perforce: {e}")
             return False
+        return any("depotFile" in record for record in records)
 
     def checkout_file(self, filepath: str):
         """Check out the file in Perforce."""
-        result = subprocess.run(["p4", "edit", filepath], capture_output=True, text=True)
-        if result.returncode == 0:
-            logger.info(f"Checked out: {filepath}")
-        else:
-            if "already opened for edit" in result.stderr:
-                logger.warning(f"File '{filepath}' is already checked out by another user.")
-                raise Exception(f"Cannot check out '{filepath}': It is already checked out by another user.")
-            logger.error(f"Error checking out file: {result.stderr}")
-            raise Exception(f"Error checking out '{filepath}': {result.stderr}")
+        records = self.session.run("edit", filepath)
+        failed = errors(records)
+        if failed:
+            logger.error(f"Error checking out file: {failed[0]}")
+            raise Exception(f"Error checking out '{filepath}': {failed[0]}")
+
+        for record in records:
+            if record.get("code") == "stat" and record.get("otherOpen"):
+                logger.warning(f"File '{filepath}' is also opened by another user.")
+        logger.info(f"Checked out: {filepath}")
+
+    # Batch mode
+    #################################################
+
+    def get_file_statuses(self, filepaths) -> dict:
+        """
+        Run a single `p4 -x - fstat` over all paths and return a map of path -> status.
+        Status is one of "NEW" (not in the depot), "CHECKED_IN", "OPENED" (already opened by this client in the default
+        changelist) or "OPENED_PENDING" (already opened in a numbered pending changelist, e.g. one of the user's).
+        """
+        statuses = {normalize_path(path): "NEW" for path in filepaths}
+
+        # Only the paths without a valid cache entry go to the server
+        to_query = list(statuses)
+        client = self.get_cache_client()
+        if client is not None:
+            to_query = []
+            for path in statuses:
+                entry = self.cache.get(client, path)
+                if entry is None:
+                    to_query.append(path)
+                else:
+                    statuses[path] = entry["status"]
+        if not to_query:
+            return statuses
+
+        try:
+            with self.profiler.span("p4 fstat"):
+                records = self.session.run("fstat", filepaths=to_query)
+        except PerforceError as e:
+            logger.error(f"Error checking file status in Perforce: {e}")
+            return statuses
+
+        depot_records = {}
+        for record in records:
+            client_file = record.get("clientFile")
+            if record.get("code") != "stat" or not client_file:
+                continue
+            path = normalize_path(client_file)
+            if path not in statuses:
+                continue
+            depot_records[path] = record
+            if "action" in record:
+                statuses[path] = "OPENED" if record.get("change", "default") == "default" else "OPENED_PENDING"
+            elif "headRev" in record and record.get("headAction") not in ("delete", "move/delete"):
+                statuses[path] = "CHECKED_IN"
+
+        if client is not None:
+            for path in to_query:
+                record = depot_records.get(path, {})
+                self.cache.put(client, path, statuses[path], record.get("depotFile"), record.get("headRev"))
+        return statuses
+
+    def prepare_files_for_export(self, filepaths, changelist: str = None) -> dict:
+        """
+        Resolve the Perforce status of all export paths up front and open the checked in ones for edit
+        with a single `p4 -x - edit`. Returns a map of path -> "EDIT", "ADD" or "FAILED".
+        "ADD" paths are not in the depot yet and should be passed to add_files() once they are written.
+        With a changelist, files opened earlier in the default changelist are moved into it with a single
+        `p4 -x - reopen`. Files the user opened in their own pending changelists stay there, so the final
+        `revert -a` of the changelist never reverts them.
+        """
+        statuses = self.get_file_statuses(filepaths)
+        plan = {}
+        to_edit = []
+        to_reopen = []
+        for path, status in statuses.items():
+            if status == "NEW":
+                plan[path] = "ADD"
+            elif status == "OPENED":
+                plan[path] = "EDIT"
+                to_reopen.append(path)
+            elif status == "OPENED_PENDING":
+                plan[path] = "EDIT"
+            else:
+                to_edit.append(path)
+
+        if changelist and to_reopen:
+            try:
+                with self.profiler.span("p4 reopen"):
+                    failed = errors(self.session.run("reopen", "-c", changelist, filepaths=to_reopen))
+                if failed:
+                    logger.warning(f"Perforce reopen reported: {failed[0]}")
+            except PerforceError as e:
+                logger.error(f"Error moving files to changelist {changelist}: {e}")
+
+        if not to_edit:
+            return plan
+
+        opened = set()
+        try:
+            with self.profiler.span("p4 edit"):
+                records = self.session.run("edit", *changelist_args(changelist), filepaths=to_edit)
+            for record in records:
+                if record.get("code") == "stat" and record.get("clientFile"):
+                    opened.add(normalize_path(record["clientFile"]))
+                elif record.get("code") == "error":
+                    logger.warning(f"Perforce edit reported: {record.get('data', '').strip()}")
+        except PerforceError as e:
+            # The call may have been stopped partway, ask which files it opened before failing the others
+            logger.error(f"Error checking out files: {e}")
+            client = self.get_cache_client()
+            if client is not None:
+                self.cache.invalidate(client, to_edit)
+            opened = {path for path, status in self.get_file_statuses(to_edit).items() if status.startswith("OPENED")}
+
+        for path in to_edit:
+            if path in opened:
+                plan[path] = "EDIT"
+                logger.info(f"Checked out: {path}")
+            else:
+                plan[path] = "FAILED"
+                logger.error(f"Error checking out file: {path}")
+
+        client = self.get_cache_client()
+        if client is not None:
+            self.cache.mark_opened(client, opened, opened_status(changelist))
+        return plan
+
+    def add_files(self, filepaths, changelist: str = None) -> bool:
+        """Mark newly written files for add with a single `p4 -x - add`."""
+        paths = [normalize_path(path) for path in filepaths if os.path.isfile(path)]
+        if not paths:
+            return True
+
+        try:
+            with self.profiler.span("p4 add"):
+                failed = errors(self.session.run("add", *changelist_args(changelist), filepaths=paths))
+        except PerforceError as e:
+            logger.error(f"Error adding files to Perforce: {e}")
+            return False
+
+        if failed:
+            logger.error(f"Error adding files to Perforce: {failed[0]}")
+            return False
+
+        client = self.get_cache_client()
+        if client is not None:
+            self.cache.mark_opened(client, paths, opened_status(changelist))
+        return True
+
+    # Changelists
+    #################################################
+
+    def create_changelist(self, description: str):
+        """Create a numbered pending changelist and return its number, or None when it could not be created."""
+        spec = "Change: new\n\n"
+        if self.session.client:
+            spec += f"Client: {self.session.client}\n\n"
+        if self.session.user:
+            spec += f"User: {self.session.user}\n\n"
+        spec += "Description:\n" + "".join(f"\t{line}\n" for line in description.splitlines() or [""])
+
+        try:
+            with self.profiler.span("p4 change"):
+                result = self.session.run_text("change", "-i", input=spec)
+        except PerforceError as e:
+            logger.error(f"Error creating a changelist: {e}")
+            return None
+
+        match = re.search(r"Change (\d+) created", result.stdout)
+        if result.returncode != 0 or match is None:
+            logger.error(f"Error creating a changelist: {result.stderr.strip() or result.stdout.strip()}")
+            return None
+        logger.info(f"Created changelist {match.group(1)}")
+        return match.group(1)
+
+    def revert_unchanged(self, changelist: str) -> list:
+        """Revert the files of the changelist whose content did not change with `p4 revert -a`, return their paths."""
+        try:
+            with self.profiler.span("p4 revert"):
+                records = self.session.run("revert", "-a", "-c", changelist)
+        except PerforceError as e:
+            logger.error(f"Error reverting unchanged files: {e}")
+            return []
+
+        reverted = [normalize_path(record["clientFile"]) for record in records if record.get("code") == "stat" and record.get("clientFile")]
+        client = self.get_cache_client()
+        if client is not None:
+            self.cache.invalidate(client, reverted)
+        return reverted
+
+    def delete_changelist_if_empty(self, changelist: str) -> bool:
+        """Delete the changelist when nothing is left in it; p4 refuses to delete it while files are open."""
+        try:
+            records = self.session.run("opened", "-c", changelist)
+        except PerforceError as e:
+            logger.error(f"Error listing changelist {changelist}: {e}")
+            return False
+        if any(record.get("code") == "stat" for record in records):
+            return False
+
+        try:
+            result = self.session.run_text("change", "-d", changelist)
+        except PerforceError as e:
+            logger.error(f"Error deleting changelist {changelist}: {e}")
+            return False
+        return result.returncode == 0
+
+    def update_cache(self, written_paths):
+        """Record the new state on disk of the opened files an export just wrote and save the cache."""
+        client = self.get_cache_client()
+        if client is None:
+            return
+        self.cache.touch(client, (normalize_path(path) for path in written_paths))
+        self.cache.save()
+
+
+def changelist_args(changelist: str = None) -> list:
+    """Return the `-c` option that opens files in the given changelist instead of the default one."""
+    return ["-c", changelist] if changelist else []
+
+
+def opened_status(changelist: str = None) -> str:
+    """Return the status of files BBatch opened, see get_file_statuses()."""
+    return "OPENED_PENDING" if changelist else "OPENED"
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a local path so it can be used as a key in status maps."""
+    return os.path.normcase(os.path.abspath(path))
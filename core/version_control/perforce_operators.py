@@ -1,5 +1,9 @@
 import bpy
-import subprocess
+
+from .perforce import test_connection
+from .perforce_session import get_session
+from .perforce_utils import start_settings_probe, get_preferences, redraw_preferences
+from .perforce_worker import get_worker, stop_worker
 
 
 class BBATCH_OT_TestPerforceConnection(bpy.types.Operator):
@@ -11,37 +15,46 @@ class BBATCH_OT_TestPerforceConnection(bpy.types.Operator):
         # Retrieve the Perforce settings from the preferences
         addon_name = "BBatch"  # Make sure this matches bl_info['name'] in __init__.py
         prefs = context.preferences.addons[addon_name].preferences
-        server = prefs.p4_server
-        user = prefs.p4_user
-        client = prefs.p4_client
+
+        # Point the shared session at the configured server, the exporter reuses it and its ticket
+        session = get_session()
+        session.configure(prefs.p4_server, prefs.p4_user, prefs.p4_client)
+        session.timeout = prefs.p4_timeout or None
+
+        # Log in and run 'p4 info' on the worker thread, the status is updated once the server answered
         password = prefs.p4_password
+        prefs.connection_status = "TESTING"
+        prefs.connection_message = f"Connecting to {prefs.p4_server}..."
+        get_worker().submit("connection test", lambda: test_connection(session, password), on_connection_tested)
+        return {"FINISHED"}
+
+
+def on_connection_tested(job):
+    """Show the result of the background connection test in the preferences."""
+    prefs = get_preferences()
+    if prefs is None:
+        return
+
+    if job.error is None:
+        prefs.connection_status = "SUCCESS"
+        prefs.connection_message = job.result
+    else:
+        prefs.connection_status = "FAILED"
+        prefs.connection_message = f"Error connecting to Perforce: {job.error}"
+    redraw_preferences()
 
-        # Set environment variables for Perforce
-        subprocess.run(["p4", "set", f"P4PORT={server}"], capture_output=True, text=True)
-        subprocess.run(["p4", "set", f"P4USER={user}"], capture_output=True, text=True)
-        subprocess.run(["p4", "set", f"P4CLIENT={client}"], capture_output=True, text=True)
-
-        # Attempt to log in to Perforce
-        try:
-            login_process = subprocess.run(["p4", "login"], input=password + "\n", capture_output=True, text=True)
-
-            if login_process.returncode != 0:
-                self.report({"ERROR"}, f"Perforce login failed: {login_process.stderr}")
-                prefs.connection_status = "FAILED"
-                return {"CANCELLED"}
-
-            # Test the connection with 'p4 info' to verify it's successful
-            info_process = subprocess.run(["p4", "info"], capture_output=True, text=True)
-            if info_process.returncode == 0:
-                self.report({"INFO"}, "Perforce connection successful!")
-                prefs.connection_status = "SUCCESS"
-                return {"FINISHED"}
-            else:
-                self.report({"ERROR"}, f"Error connecting to Perforce: {info_process.stderr}")
-                prefs.connection_status = "FAILED"
-                return {"CANCELLED"}
-
-        except Exception as e:
-            self.report({"ERROR"}, f"An error occurred: {str(e)}")
-            prefs.connection_status = "FAILED"
+
+class BBATCH_OT_DetectPerforceSettings(bpy.types.Operator):
+    bl_idname = "bbatch.detect_perforce_settings"
+    bl_label = "Detect Perforce Settings"
+    bl_description = "Read server, user and client from `p4 set` in the background and fill them in"
+
+    def execute(self, context):
+        if not start_settings_probe(overwrite=True):
+            self.report({"INFO"}, "Perforce settings detection is already running")
             return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+def unregister():
+    stop_worker()
@@ -1,7 +1,7 @@
 from bpy.types import AddonPreferences
-from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, IntProperty
 
-from .perforce_utils import get_perforce_settings_from_system
+from .perforce_utils import request_settings_probe, is_settings_probe_running
 
 
 class BBATCH_AddonPreferences(AddonPreferences):
@@ -51,28 +51,52 @@ class BBATCH_AddonPreferences(AddonPreferences):
         default=""
     )
 
+    p4_use_changelist: BoolProperty(
+        name="Numbered Changelist",
+        description="Open every export batch in a new numbered changelist and revert the files that did not change",
+        default=False
+    )
+
+    p4_cache_ttl: IntProperty(
+        name="Status Cache (minutes)",
+        description="How long file states from p4 fstat are reused across exports, 0 disables the cache",
+        default=60,
+        min=0
+    )
+
     connection_status: EnumProperty(
         name="Connection Status",
         description="Status of the last Perforce connection test",
         items=[
             ('NOT_TESTED', "Not Tested", ""),
+            ('TESTING', "Testing", ""),
             ('SUCCESS', "Success", ""),
             ('FAILED', "Failed", "")
         ],
         default='NOT_TESTED'
     )
 
+    connection_message: StringProperty(
+        name="Connection Message",
+        description="Result of the last Perforce connection test",
+        default=""
+    )
+
+    p4_timeout: IntProperty(
+        name="Timeout (seconds)",
+        description="How long a single Perforce call may take before it is given up, 0 waits indefinitely",
+        default=15,
+        min=0
+    )
+
     # fmt: on
 
     def draw(self, context):
         layout = self.layout
 
-        # Check if we already have values; if not, auto-detect them
+        # Check if we already have values; if not, auto-detect them in the background, draw() never waits on p4
         if not self.p4_server or not self.p4_user or not self.p4_client:
-            detected_settings = get_perforce_settings_from_system()
-            self.p4_server = detected_settings.get("server", "perforce:1666") or ""
-            self.p4_user = detected_settings.get("user", "") or ""
-            self.p4_client = detected_settings.get("client", "") or ""
+            request_settings_probe()
 
         # Toggle button to enable/disable Perforce
         layout.prop(self, "enable_perforce")
@@ -84,19 +108,31 @@ class BBATCH_AddonPreferences(AddonPreferences):
         else:
             box.enabled = False
 
-        box.label(text="Perforce Settings")
+        row = box.row()
+        row.label(text="Perforce Settings")
+        if is_settings_probe_running():
+            row.label(text="Detecting...", icon="TIME")
+        else:
+            row.operator("bbatch.detect_perforce_settings", text="Detect", icon="FILE_REFRESH")
         box.prop(self, "p4_server")
         box.prop(self, "p4_user")
         box.prop(self, "p4_client")
         box.prop(self, "p4_password")
+        box.prop(self, "p4_use_changelist")
+        box.prop(self, "p4_cache_ttl")
+        box.prop(self, "p4_timeout")
 
         # Determine the icon based on the connection status
         if self.connection_status == "SUCCESS":
             icon = "CHECKMARK"
         elif self.connection_status == "FAILED":
             icon = "ERROR"
+        elif self.connection_status == "TESTING":
+            icon = "TIME"
         else:
             icon = "FILE_REFRESH"
 
-        # Add a "Test Connection" button
+        # Add a "Test Connection" button, the test runs in the background and updates the status below
         box.operator("bbatch.test_perforce_connection", text="Test Connection", icon=icon)
+        if self.connection_message:
+            box.label(text=self.connection_message, icon=icon)
@@ -0,0 +1,173 @@
+import io
+import os
+import math
+import marshal
+import subprocess
+import threading
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Batched `-x -` calls get the timeout once per this many files, a fixed limit would kill large batches partway
+FILES_PER_TIMEOUT = 100
+
+
+class PerforceError(Exception):
+    """Raised when the p4 executable cannot be run."""
+
+
+class PerforceSession:
+    """
+    A shared Perforce session.
+    Commands run through `p4 -G`, so results come back as marshalled records instead of human-readable text.
+    Server, user, client and the login ticket are passed explicitly on every call, so nothing is written to the
+    user's p4 environment and the ticket from one login is reused for the whole Blender session. The ticket goes
+    through the P4PASSWD environment variable of the p4 process, never on its command line where other users see it.
+    """
+
+    def __init__(self, executable: str = "p4"):
+        self.executable = executable
+        self.server = None
+        self.user = None
+        self.client = None
+        self.ticket = None
+        # Seconds a single p4 call may take, None waits for the server as long as it takes
+        self.timeout = None
+        self._lock = threading.Lock()
+
+    def configure(self, server=None, user=None, client=None):
+        """Set the connection settings; empty values fall back to the p4 environment."""
+        with self._lock:
+            if (server, user, client) != (self.server, self.user, self.client):
+                self.ticket = None
+            self.server = server or None
+            self.user = user or None
+            self.client = client or None
+
+    def global_args(self) -> list:
+        """Return the global options shared by every command."""
+        args = []
+        if self.server:
+            args += ["-p", self.server]
+        if self.user:
+            args += ["-u", self.user]
+        if self.client:
+            args += ["-c", self.client]
+        return args
+
+    def environment(self):
+        """Return the environment of the p4 process, None inherits Blender's own."""
+        if not self.ticket:
+            return None
+        return dict(os.environ, P4PASSWD=self.ticket)
+
+    def run(self, *command, filepaths=None, timeout=None) -> list:
+        """
+        Run a p4 command and return its records as dictionaries with string keys and values.
+        When filepaths are given they are fed through `-x -`, so a whole batch costs a single process, and the
+        timeout grows with the number of files.
+        """
+        args = [self.executable, "-G"] + self.global_args()
+        stdin = None
+        if timeout is None:
+            timeout = self.timeout
+        if filepaths is not None:
+            args += ["-x", "-"]
+            stdin = ("\n".join(filepaths) + "\n").encode("utf-8")
+            if timeout:
+                timeout *= max(1, math.ceil(len(filepaths) / FILES_PER_TIMEOUT))
+        args += list(command)
+
+        try:
+            result = subprocess.run(args, input=stdin, capture_output=True, env=self.environment(), timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise PerforceError(f"Could not run p4 {' '.join(command)}: {e}") from e
+
+        records = parse_marshalled_records(result.stdout)
+        if result.stderr:
+            records.append({"code": "error", "data": result.stderr.decode("utf-8", "replace").strip()})
+        return records
+
+    def run_text(self, *command, input=None, timeout=None) -> subprocess.CompletedProcess:
+        """Run a p4 command without -G, for the few commands that only speak text (set, login -p)."""
+        args = [self.executable] + self.global_args() + list(command)
+        try:
+            return subprocess.run(
+                args, input=input, capture_output=True, text=True, env=self.environment(), timeout=self.timeout if timeout is None else timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise PerforceError(f"Could not run p4 {' '.join(command)}: {e}") from e
+
+    def login(self, password=None, timeout=None) -> bool:
+        """Log in and keep the ticket for later calls. Without a password the existing ticket is checked."""
+        if not password:
+            records = self.run("login", "-s", timeout=timeout)
+            return not errors(records)
+
+        self.ticket = None
+        result = self.run_text("login", "-p", input=password + "\n", timeout=timeout)
+        if result.returncode != 0:
+            logger.error(f"Perforce login failed: {result.stderr}")
+            return False
+
+        # `login -p` prints the ticket on the last line of its output
+        lines = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+        self.ticket = lines[-1] if lines else None
+        return True
+
+    def info(self, timeout=None) -> dict:
+        """Return the `p4 info` record, raising PerforceError when the server cannot be reached."""
+        records = self.run("info", timeout=timeout)
+        failed = errors(records)
+        if failed or not records:
+            raise PerforceError(failed[0] if failed else "No response from the Perforce server.")
+        return records[0]
+
+    def settings(self, timeout=None) -> dict:
+        """Return the p4 settings (P4PORT, P4USER, ...) of the user's environment."""
+        result = self.run_text("set", "-q", timeout=timeout)
+        settings = {}
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
+                key, sep, value = line.partition("=")
+                if sep:
+                    settings[key.strip()] = value.strip()
+        return settings
+
+
+def parse_marshalled_records(output: bytes) -> list:
+    """Decode the stream of marshalled dictionaries written by `p4 -G`."""
+    records = []
+    stream = io.BytesIO(output)
+    while True:
+        try:
+            record = marshal.load(stream)
+        except (EOFError, ValueError, TypeError):
+            break
+        records.append({decode(key): decode(value) for key, value in record.items()})
+    return records
+
+
+def decode(value):
+    """Decode a marshalled bytes value to str."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return value
+
+
+def errors(records) -> list:
+    """Return the messages of the error records."""
+    return [record.get("data", "").strip() for record in records if record.get("code") == "error"]
+
+
+_session = None
+
+
+def get_session() -> PerforceSession:
+    """Return the session shared by the exporter, the operators and the settings detector."""
+    global _session
+    if _session is None:
+        # BBATCH_P4 points the addon at another p4 executable, e.g. a local fake p4 for testing
+        _session = PerforceSession(os.environ.get("BBATCH_P4", "p4"))
+    return _session
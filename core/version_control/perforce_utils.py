@@ -1,35 +1,108 @@
-import subprocess
 import re
 
+import bpy
 
-def get_perforce_settings_from_system():
+from .perforce_session import PerforceError, get_session
+from .perforce_worker import get_worker
+
+# `p4 set` only reads the local environment, but a missing or broken p4 must not keep the probe alive forever
+PROBE_TIMEOUT = 10.0
+
+PREFERENCE_FIELDS = (("p4_server", "server"), ("p4_user", "user"), ("p4_client", "client"))
+
+
+class SettingsProbe:
+    """State of the background `p4 set` probe, shared by the preferences and the detect operator."""
+
+    def __init__(self):
+        self.running = False
+        self.overwrite = False
+        self.done = False
+
+
+_probe = SettingsProbe()
+
+
+def get_perforce_settings_from_system(timeout=None):
     """
     Detects and returns Perforce settings (server, user, client) from the system.
     Cleans up output to remove extra information like config paths in parentheses.
     Returns a dictionary with keys: 'server', 'user', and 'client'.
+    This spawns `p4 set` and blocks, UI code uses start_settings_probe() instead.
     """
     settings = {"server": None, "user": None, "client": None}
 
     try:
-        # Run `p4 set` to get all Perforce settings
-        result = subprocess.run(["p4", "set"], capture_output=True, text=True)
-
-        if result.returncode == 0 and result.stdout:
-            # Parse each line for P4PORT, P4USER, and P4CLIENT
-            for line in result.stdout.splitlines():
-                if "P4PORT" in line:
-                    settings["server"] = clean_perforce_value(extract_value_from_line(line))
-                elif "P4USER" in line:
-                    settings["user"] = clean_perforce_value(extract_value_from_line(line))
-                elif "P4CLIENT" in line:
-                    settings["client"] = clean_perforce_value(extract_value_from_line(line))
-
-    except Exception as e:
+        # Ask the shared session for the `p4 set` values of P4PORT, P4USER, and P4CLIENT
+        values = get_session().settings(timeout=timeout)
+        for key, name in (("P4PORT", "server"), ("P4USER", "user"), ("P4CLIENT", "client")):
+            if values.get(key):
+                settings[name] = clean_perforce_value(values[key])
+
+    except PerforceError as e:
         print(f"Error detecting Perforce settings: {e}")
 
     return settings
 
 
+def start_settings_probe(overwrite: bool = False) -> bool:
+    """
+    Detect the settings on the Perforce worker thread, the result is applied to the preferences on the main thread.
+    Empty preference fields are filled in; with `overwrite` the detected values replace the current ones.
+    Returns False when a probe is already running.
+    """
+    if _probe.running:
+        return False
+
+    _probe.running = True
+    _probe.overwrite = overwrite
+    get_worker().submit("settings probe", lambda: get_perforce_settings_from_system(timeout=PROBE_TIMEOUT), _on_settings_probed)
+    return True
+
+
+def request_settings_probe():
+    """Start the probe once per session, cheap enough to call from draw()."""
+    if not _probe.done and not _probe.running:
+        start_settings_probe()
+
+
+def is_settings_probe_running() -> bool:
+    return _probe.running
+
+
+def _on_settings_probed(job):
+    _probe.running = False
+    _probe.done = True
+    apply_detected_settings(job.result or {}, overwrite=_probe.overwrite)
+
+
+def apply_detected_settings(settings: dict, overwrite: bool = False):
+    """Copy the detected settings into the addon preferences and redraw them."""
+    prefs = get_preferences()
+    if prefs is None:
+        return
+
+    for field, key in PREFERENCE_FIELDS:
+        value = settings.get(key)
+        if value and (overwrite or not getattr(prefs, field)):
+            setattr(prefs, field, value)
+    redraw_preferences()
+
+
+def get_preferences():
+    """Return the BBatch addon preferences, or None while the addon is not enabled."""
+    addon = bpy.context.preferences.addons.get("BBatch")
+    return addon.preferences if addon is not None else None
+
+
+def redraw_preferences():
+    """Redraw the preferences windows, e.g. after a background Perforce call updated them."""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == "PREFERENCES":
+                area.tag_redraw()
+
+
 def extract_value_from_line(line):
     """
     Extracts the value from a line in the format 'P4PORT=server_address'.
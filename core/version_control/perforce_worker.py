@@ -0,0 +1,118 @@
+import queue
+import threading
+import logging
+
+import bpy
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+
+class PerforceJob:
+    """A Perforce call queued on the worker. `result` or `error` is set once it ran."""
+
+    __slots__ = ("name", "func", "callback", "result", "error")
+
+    def __init__(self, name, func, callback=None):
+        self.name = name
+        self.func = func
+        self.callback = callback
+        self.result = None
+        self.error = None
+
+
+class PerforceWorker:
+    """
+    Runs Perforce calls on a background thread so the UI never waits on the server.
+    Finished jobs go into a result queue that a bpy.app.timers callback drains on the main thread, where the job
+    callbacks may safely touch Blender data. Jobs run one at a time, in order, as they share the session and its ticket.
+    """
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted jobs whose callback has not run yet."""
+        return self._pending
+
+    def submit(self, name: str, func, callback=None) -> PerforceJob:
+        """Run func() on the worker thread, then callback(job) on the main thread."""
+        job = PerforceJob(name, func, callback)
+        with self._lock:
+            self._pending += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, name="bbatch_p4_worker", daemon=True)
+                self._thread.start()
+        self._jobs.put(job)
+
+        if not bpy.app.timers.is_registered(poll_results):
+            bpy.app.timers.register(poll_results, first_interval=POLL_INTERVAL)
+        return job
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                job.result = job.func()
+            except Exception as e:
+                logger.error(f"Perforce {job.name} failed: {e}")
+                job.error = e
+            self._results.put(job)
+
+    def deliver(self) -> bool:
+        """Run the callbacks of the finished jobs on the calling thread, return True while jobs are pending."""
+        while True:
+            try:
+                job = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._pending -= 1
+            if job.callback is not None:
+                try:
+                    job.callback(job)
+                except Exception:
+                    logger.exception(f"Callback of Perforce {job.name} failed")
+        return self._pending > 0
+
+    def stop(self):
+        """Let the thread finish its current job and exit, and stop polling."""
+        self._jobs.put(None)
+        self._thread = None
+        if bpy.app.timers.is_registered(poll_results):
+            bpy.app.timers.unregister(poll_results)
+
+
+_worker = None
+
+
+def get_worker() -> PerforceWorker:
+    """Return the worker shared by the preferences and the operators."""
+    global _worker
+    if _worker is None:
+        _worker = PerforceWorker()
+    return _worker
+
+
+def poll_results():
+    """Timer callback: deliver the finished jobs, keep polling while jobs are pending."""
+    if _worker is None:
+        return None
+    return POLL_INTERVAL if _worker.deliver() else None
+
+
+def stop_worker():
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import stat
+import importlib
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_P4 = os.path.join(REPO_ROOT, "benchmarks", "fake_p4.py")
+
+# The addon package itself imports bpy, the modules under test are imported through `core` directly
+sys.path.insert(0, REPO_ROOT)
+
+
+class FakeDepot:
+    """Seeds and inspects the JSON state of benchmarks/fake_p4.py."""
+
+    def __init__(self, folder):
+        self.folder = str(folder)
+        self.state_path = os.path.join(self.folder, "fake_p4_state.json")
+        self.save({"depot": {}, "opened": {}, "changes": [], "next_change": 1})
+
+    def path(self, name: str) -> str:
+        return os.path.normcase(os.path.join(self.folder, name))
+
+    def load(self) -> dict:
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, state: dict):
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def write_file(self, name: str, content: bytes = b"data") -> str:
+        path = self.path(name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def check_in(self, name: str, content: bytes = b"data") -> str:
+        """Write a file and record it in the depot at revision 1, read-only like a synced file."""
+        path = self.write_file(name, content)
+        os.chmod(path, stat.S_IREAD)
+        state = self.load()
+        state["depot"][path] = {"rev": 1}
+        self.save(state)
+        return path
+
+    def open(self, name: str, action: str = "edit", change: str = "default") -> str:
+        """Mark a file as opened by the user, outside BBatch."""
+        path = self.path(name)
+        if action == "edit":
+            os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+        state = self.load()
+        state["opened"][path] = {"action": action, "change": change, "digest": None}
+        self.save(state)
+        return path
+
+    def opened(self) -> dict:
+        return self.load()["opened"]
+
+
+@pytest.fixture
+def fake_depot(tmp_path, monkeypatch):
+    """Put a `p4` running benchmarks/fake_p4.py first on PATH and return its depot."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    if os.name == "nt":
+        (bin_dir / "p4.bat").write_text(f'@"{sys.executable}" "{FAKE_P4}" %*\n')
+    else:
+        script = bin_dir / "p4"
+        script.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_P4}" "$@"\n')
+        script.chmod(0o755)
+
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    depot = FakeDepot(workspace)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.setenv("FAKE_P4_STATE", depot.state_path)
+    return depot
+
+
+@pytest.fixture
+def perforce_manager(fake_depot):
+    """A PerforceManager on a fresh session that runs the fake `p4` found on PATH."""
+    from core.version_control.perforce_manager import PerforceManager
+    from core.version_control.perforce_session import PerforceSession
+
+    return PerforceManager(session=PerforceSession("p4"))
+
+
+@pytest.fixture(scope="session")
+def blender_addon(tmp_path_factory):
+    """Enable the addon from this checkout in bpy and return its package, skipped where bpy is not available."""
+    pytest.importorskip("bpy")
+    import addon_utils
+
+    # The exporters read the preferences of the 'BBatch' addon, link the checkout under that name
+    addons_dir = tmp_path_factory.mktemp("addons")
+    os.symlink(REPO_ROOT, addons_dir / "BBatch", target_is_directory=True)
+    sys.path.insert(0, str(addons_dir))
+    addon_utils.enable("BBatch", default_set=True)
+    return importlib.import_module("BBatch")
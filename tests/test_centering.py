@@ -0,0 +1,128 @@
+import os
+import math
+import importlib
+
+import pytest
+
+# Runs with Blender's Python, or with the bpy module installed
+bpy = pytest.importorskip("bpy")
+
+CUBE_VERTICES = [(x, y, z) for x in (-1.0, 1.0) for y in (-1.0, 2.0) for z in (0.0, 3.0)]
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+
+def clear_file():
+    """Remove the objects and meshes left by the previous export or import."""
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+def make_asset(location):
+    """Create a fresh asset, rotated and scaled so centering has more than a translation to get right."""
+    clear_file()
+    mesh = bpy.data.meshes.new("SM_Crate")
+    mesh.from_pydata(CUBE_VERTICES, [], CUBE_FACES)
+    obj = bpy.data.objects.new("SM_Crate", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.location = location
+    obj.rotation_euler = (0.3, 0.0, 1.1)
+    obj.scale = (1.0, 2.0, 0.5)
+    return obj
+
+
+# Format -> (importer module, importer name, importer arguments) used to read the exported file back
+IMPORTERS = {
+    ".fbx": ("import_scene", "fbx", {}),
+    ".obj": ("wm", "obj_import", {}) if bpy.app.version >= (4, 0, 0) else ("import_scene", "obj", {}),
+    ".stl": ("wm", "stl_import", {}) if bpy.app.version >= (4, 2, 0) else ("import_mesh", "stl", {}),
+    ".gltf": ("import_scene", "gltf", {}),
+    ".dae": ("wm", "collada_import", {}),
+    ".abc": ("wm", "alembic_import", {"as_background_job": False}),
+}
+
+
+def get_operator(module: str, name: str):
+    """Return the operator, skipping the test when this Blender build does not have it."""
+    operator = getattr(getattr(bpy.ops, module), name)
+    try:
+        operator.get_rna_type()
+    except KeyError:
+        pytest.skip(f"bpy.ops.{module}.{name} is not available in Blender {bpy.app.version_string}")
+    return operator
+
+
+def export_asset(blender_addon, export_format, folder, obj, center: bool) -> str:
+    props = bpy.context.scene.panel_properties
+    props.center_transform = center
+    props.non_destructive = False
+    props.one_material_ID = False
+    props.export_source = "SELECTION"
+
+    exporter_class = importlib.import_module(f"{blender_addon.__name__}.core.exporters").get_exporter_class(export_format)
+    exporter = exporter_class(
+        bpy.context,
+        export_objects=[obj],
+        export_folder=str(folder),
+        use_perforce=False,
+        incremental_export=False,
+        show_report=False,
+        post_export_stages=(),
+        use_journal=False,
+    )
+    exporter.do_export()
+    assert not exporter.skipped_exports
+    return os.path.join(str(folder), f"SM_Crate{export_format}")
+
+
+def read_world_positions(filepath) -> list:
+    """Import the file into an empty scene and return the world positions of every vertex it holds."""
+    clear_file()
+    module, name, arguments = IMPORTERS[os.path.splitext(filepath)[1]]
+    get_operator(module, name)(filepath=filepath, **arguments)
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    positions = []
+    for obj in bpy.context.scene.objects:
+        if obj.type != "MESH":
+            continue
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        positions.extend(tuple(evaluated.matrix_world @ vertex.co) for vertex in mesh.vertices)
+        evaluated.to_mesh_clear()
+    return sorted(positions)
+
+
+@pytest.mark.parametrize("export_format", list(IMPORTERS))
+def test_centered_copy_matches_asset_at_origin(blender_addon, tmp_path, export_format):
+    get_operator(*IMPORTERS[export_format][:2])
+    # Reference: the asset already sits at the origin, centering has nothing to do
+    at_origin_path = export_asset(blender_addon, export_format, tmp_path / "origin", make_asset((0.0, 0.0, 0.0)), center=False)
+    # Centered through the scratch copy, the scene object itself stays where it is
+    obj = make_asset((5.0, -3.0, 2.0))
+    centered_path = export_asset(blender_addon, export_format, tmp_path / "centered", obj, center=True)
+    assert tuple(obj.location) == pytest.approx((5.0, -3.0, 2.0))
+
+    at_origin = read_world_positions(at_origin_path)
+    centered = read_world_positions(centered_path)
+
+    # glTF splits the vertices of flat faces, every format writes at least the corners of the box
+    assert len(centered) == len(at_origin) >= len(CUBE_VERTICES)
+    for centered_position, origin_position in zip(centered, at_origin):
+        assert all(math.isclose(a, b, abs_tol=1e-4) for a, b in zip(centered_position, origin_position))
+
+
+def test_scratch_scene_keeps_the_timing_of_the_source(blender_addon):
+    scene = bpy.context.scene
+    scene.render.fps = 30
+    scene.render.fps_base = 1.001
+    scene.frame_current = 17
+
+    scratch = importlib.import_module(f"{blender_addon.__name__}.core.scratch_scene").ScratchScene(scene)
+    try:
+        assert scratch.scene.render.fps == 30
+        assert scratch.scene.render.fps_base == pytest.approx(1.001)
+        assert scratch.scene.frame_current == 17
+    finally:
+        scratch.remove()
@@ -0,0 +1,27 @@
+import importlib
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+
+def test_single_format_of_an_older_file_is_migrated(blender_addon, tmp_path):
+    from bpy.props import EnumProperty
+
+    exporters = importlib.import_module(f"{blender_addon.__name__}.core.exporters")
+    filepath = str(tmp_path / "legacy.blend")
+
+    # Save a file the way older versions did, with the index of a single format
+    legacy_items = [(export_format, export_format.upper(), "") for export_format in exporters.LEGACY_FORMATS]
+    bpy.types.Scene.export_file_format = EnumProperty(items=legacy_items, default=".fbx")
+    try:
+        bpy.context.scene.export_file_format = ".obj"
+        bpy.ops.wm.save_as_mainfile(filepath=filepath)
+    finally:
+        del bpy.types.Scene.export_file_format
+
+    bpy.ops.wm.open_mainfile(filepath=filepath)
+
+    scene = bpy.context.scene
+    assert scene.export_file_formats == {".obj"}
+    assert exporters.LEGACY_FORMAT_PROPERTY not in exporters.stored_properties(scene)
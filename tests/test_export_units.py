@@ -0,0 +1,40 @@
+import importlib
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+
+@pytest.fixture
+def kit():
+    """A collection with two child collections holding one object each."""
+    kit = bpy.data.collections.new("Kit")
+    bpy.context.scene.collection.children.link(kit)
+    created = [kit]
+    for name in ("Walls", "Floors"):
+        child = bpy.data.collections.new(name)
+        kit.children.link(child)
+        child.objects.link(bpy.data.objects.new(f"SM_{name}", None))
+        created.append(child)
+    # Linking does not add the objects to the view layer until it is synced
+    bpy.context.view_layer.update()
+
+    yield kit
+    for collection in created:
+        for obj in list(collection.objects):
+            bpy.data.objects.remove(obj)
+        bpy.data.collections.remove(collection)
+
+
+def test_collections_exporting_to_the_same_file_are_reported(blender_addon, kit, tmp_path):
+    package = blender_addon.__name__
+    get_collection_units = importlib.import_module(f"{package}.core.export_units").get_collection_units
+    exporter_class = importlib.import_module(f"{package}.core.exporters").get_exporter_class(".fbx")
+
+    # Every child collection is named after the parent, both would write Kit.fbx
+    units = get_collection_units(kit, bpy.context.view_layer, use_children=True, naming_rule="{parent}")
+    exporter = exporter_class(bpy.context, export_units=units, export_folder=str(tmp_path), use_perforce=False, incremental_export=False)
+    exporter.plan_export()
+
+    assert [root_obj.name for root_obj in exporter.export_roots] == ["SM_Walls"]
+    assert exporter.skipped_exports == [("Floors", "Collection 'Walls' already exports to Kit.fbx")]
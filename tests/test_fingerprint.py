@@ -0,0 +1,96 @@
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+from core.manifest import fingerprint_objects  # noqa: E402
+
+SETTINGS = {"export_animations": False}
+
+
+@pytest.fixture
+def asset():
+    """A cube with everything the fingerprint has to notice: weights, shape keys, colors, a material and geometry nodes."""
+    mesh = bpy.data.meshes.new("SM_Crate")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+    obj = bpy.data.objects.new("SM_Crate", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    obj.vertex_groups.new(name="Deform").add([0, 1], 0.5, "REPLACE")
+    obj.shape_key_add(name="Basis")
+    obj.shape_key_add(name="Dent")
+    mesh.color_attributes.new("Color", "FLOAT_COLOR", "POINT")
+
+    material = bpy.data.materials.new("M_Crate")
+    if bpy.app.version < (5, 0, 0):
+        material.use_nodes = True
+    mesh.materials.append(material)
+
+    node_group = bpy.data.node_groups.new("GN_Crate", "GeometryNodeTree")
+    node_group.interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    node_group.interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    node_group.interface.new_socket("Size", in_out="INPUT", socket_type="NodeSocketFloat")
+    obj.modifiers.new("GeometryNodes", "NODES").node_group = node_group
+
+    yield obj
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    bpy.data.materials.remove(material)
+    bpy.data.node_groups.remove(node_group)
+
+
+def change_weight(obj):
+    obj.vertex_groups["Deform"].add([0], 0.9, "REPLACE")
+
+
+def change_shape_key(obj):
+    obj.data.shape_keys.key_blocks["Dent"].data[0].co.z = 1.0
+
+
+def change_color(obj):
+    obj.data.color_attributes["Color"].data[0].color = (1.0, 0.0, 0.0, 1.0)
+
+
+def change_sharp_edge(obj):
+    obj.data.edges[0].use_edge_sharp = True
+
+
+def change_custom_normals(obj):
+    obj.data.normals_split_custom_set_from_vertices([(0.0, 0.6, 0.8)] * len(obj.data.vertices))
+
+
+def change_material(obj):
+    principled = obj.active_material.node_tree.nodes["Principled BSDF"]
+    principled.inputs["Base Color"].default_value = (1.0, 0.0, 0.0, 1.0)
+
+
+def change_geometry_nodes_input(obj):
+    modifier = obj.modifiers["GeometryNodes"]
+    identifier = modifier.node_group.interface.items_tree["Size"].identifier
+    modifier[identifier] = 2.0
+
+
+@pytest.mark.parametrize(
+    "change",
+    [change_weight, change_shape_key, change_color, change_sharp_edge, change_custom_normals, change_material, change_geometry_nodes_input],
+)
+def test_change_alters_fingerprint(asset, change):
+    before = fingerprint_objects([asset], SETTINGS)
+    assert fingerprint_objects([asset], SETTINGS) == before
+
+    change(asset)
+
+    assert fingerprint_objects([asset], SETTINGS) != before
+
+
+def test_non_destructive_is_part_of_the_fingerprint_settings(blender_addon, asset, tmp_path):
+    from importlib import import_module
+
+    props = bpy.context.scene.panel_properties
+    exporters = import_module(f"{blender_addon.__name__}.core.exporters")
+
+    def settings(non_destructive):
+        props.non_destructive = non_destructive
+        exporter = exporters.get_exporter_class(".fbx")(bpy.context, export_objects=[asset], export_folder=str(tmp_path), use_perforce=False)
+        return exporter.get_fingerprint_settings()
+
+    assert settings(False) != settings(True)
@@ -0,0 +1,56 @@
+import os
+import stat
+
+import pytest
+
+from core.version_control.fstat_cache import FstatCache
+from core.version_control.perforce_manager import PerforceManager, normalize_path
+from core.version_control.perforce_session import PerforceSession
+
+
+def make_manager(tmp_path):
+    return PerforceManager(session=PerforceSession("p4"), cache=FstatCache(str(tmp_path / "fstat_cache.json")))
+
+
+def test_entries_are_keyed_by_the_resolved_workspace(fake_depot, tmp_path):
+    manager = make_manager(tmp_path)
+    path = fake_depot.check_in("crate.fbx")
+
+    manager.get_file_statuses([path])
+
+    # The session has no client configured, the name comes from `p4 info`
+    assert list(manager.cache.entries) == [f"fake_client|{normalize_path(path)}"]
+
+
+def test_opened_files_are_served_from_the_cache(fake_depot, tmp_path):
+    manager = make_manager(tmp_path)
+    path = fake_depot.check_in("crate.fbx")
+    manager.prepare_files_for_export([path])
+    manager.update_cache([path])
+
+    # A later run would see the file as opened even without asking the server
+    fake_depot.save(dict(fake_depot.load(), opened={}))
+    assert make_manager(tmp_path).get_file_statuses([path]) == {normalize_path(path): "OPENED"}
+
+
+def test_file_made_read_only_outside_bbatch_is_queried_again(fake_depot, tmp_path):
+    manager = make_manager(tmp_path)
+    path = fake_depot.check_in("crate.fbx")
+    manager.prepare_files_for_export([path])
+    manager.update_cache([path])
+
+    # Submitted from P4V: no longer opened and read-only again, with the same size and mtime
+    fake_depot.save(dict(fake_depot.load(), opened={}))
+    mtime_ns = os.stat(path).st_mtime_ns
+    os.chmod(path, stat.S_IREAD)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    assert make_manager(tmp_path).get_file_statuses([path]) == {normalize_path(path): "CHECKED_IN"}
+
+
+def test_default_cache_lives_in_the_user_config_folder():
+    bpy = pytest.importorskip("bpy")
+    from core.version_control.fstat_cache import get_default_cache_path
+
+    config_folder = bpy.utils.user_resource("CONFIG", path="BBatch")
+    assert os.path.dirname(get_default_cache_path()) == config_folder
@@ -0,0 +1,33 @@
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+from core.utils import HierarchyIndex  # noqa: E402
+
+
+@pytest.fixture
+def objects():
+    created = {name: bpy.data.objects.new(name, None) for name in ("root", "child", "other")}
+    created["child"].parent = created["root"]
+    yield created
+    for obj in created.values():
+        bpy.data.objects.remove(obj)
+
+
+def test_reparenting_into_a_cached_subtree_rebuilds_the_index(objects):
+    index = HierarchyIndex()
+    assert index.get_descendants(objects["root"]) == [objects["child"]]
+
+    objects["other"].parent = objects["child"]
+
+    assert index.get_descendants(objects["root"]) == [objects["child"], objects["other"]]
+
+
+def test_reparenting_out_of_a_cached_subtree_rebuilds_the_index(objects):
+    index = HierarchyIndex()
+    assert index.get_descendants(objects["root"]) == [objects["child"]]
+
+    objects["child"].parent = objects["other"]
+
+    assert index.get_descendants(objects["root"]) == []
+    assert index.get_children(objects["other"]) == [objects["child"]]
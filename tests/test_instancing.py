@@ -0,0 +1,38 @@
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+from core.instancing import instance_signature  # noqa: E402
+
+
+@pytest.fixture
+def duplicates():
+    """Two linked duplicates of one mesh, each with a geometry nodes modifier on the same node group."""
+    mesh = bpy.data.meshes.new("SM_Rock")
+    node_group = bpy.data.node_groups.new("GN_Scatter", "GeometryNodeTree")
+    node_group.interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+    node_group.interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    node_group.interface.new_socket("Density", in_out="INPUT", socket_type="NodeSocketFloat")
+
+    objects = []
+    for name in ("SM_Rock_A", "SM_Rock_B"):
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+        obj.modifiers.new("GeometryNodes", "NODES").node_group = node_group
+        objects.append(obj)
+
+    yield objects
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    bpy.data.node_groups.remove(node_group)
+
+
+def test_geometry_nodes_inputs_are_part_of_the_signature(duplicates):
+    first, second = duplicates
+    assert instance_signature([first]) == instance_signature([second])
+
+    modifier = second.modifiers["GeometryNodes"]
+    modifier[modifier.node_group.interface.items_tree["Density"].identifier] = 5.0
+
+    assert instance_signature([first]) != instance_signature([second])
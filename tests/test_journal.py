@@ -0,0 +1,21 @@
+import os
+
+import pytest
+
+pytest.importorskip("bpy")
+
+from core.journal import ExportJournal, read_journal  # noqa: E402
+
+
+def test_journal_creates_a_missing_export_folder(tmp_path):
+    export_folder = str(tmp_path / "Exports" / "Props")
+
+    journal = ExportJournal(export_folder)
+    journal.open(formats=[".fbx"])
+    try:
+        assert journal.is_open
+    finally:
+        journal.close()
+
+    assert os.path.isfile(journal.filepath)
+    assert not read_journal(journal.filepath).resumable
@@ -0,0 +1,82 @@
+import os
+from types import SimpleNamespace
+
+from core.manifest import ExportManifest, fingerprint_objects
+
+SETTINGS = {"export_animations": True}
+IDENTITY = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]]
+
+
+class Collection(list):
+    """Stand-in for a bpy_prop_collection, enough for foreach_get."""
+
+    def foreach_get(self, attribute, buffer):
+        values = [value for item in self for value in flatten(getattr(item, attribute))]
+        buffer[:] = type(buffer)(buffer.typecode, values) if hasattr(buffer, "typecode") else values
+
+
+def flatten(value):
+    if isinstance(value, (int, float)):
+        return [value]
+    return [item for row in value for item in flatten(row)]
+
+
+def rna_struct(**values):
+    """Stand-in for an RNA struct whose properties are the given values, IDs are pointer properties."""
+    props = [SimpleNamespace(identifier=name, is_readonly=False, type="POINTER" if hasattr(value, "name") else "FLOAT") for name, value in values.items()]
+    return SimpleNamespace(bl_rna=SimpleNamespace(properties=props), **values)
+
+
+def make_object(name, type="EMPTY", data=None, modifiers=(), location=(0.0, 0.0, 0.0), pose=None):
+    matrix = [list(row) for row in IDENTITY]
+    for axis, value in enumerate(location):
+        matrix[axis][3] = value
+    return SimpleNamespace(
+        name=name, type=type, parent=None, matrix_world=matrix, material_slots=[], modifiers=list(modifiers), data=data, animation_data=None, pose=pose
+    )
+
+
+def make_rig(tail_z=1.0, pose_location=(0.0, 0.0, 0.0)):
+    bone = SimpleNamespace(name="Root", parent=None, head_local=(0.0, 0.0, 0.0), tail_local=(0.0, 0.0, tail_z), matrix_local=IDENTITY)
+    pose_bone = SimpleNamespace(location=pose_location, rotation_quaternion=(1.0, 0.0, 0.0, 0.0), rotation_euler=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0))
+    armature = SimpleNamespace(name="Armature", bones=Collection([bone]))
+    return make_object("Rig", "ARMATURE", armature, pose=SimpleNamespace(bones=Collection([pose_bone])))
+
+
+def test_armature_rest_pose_changes_fingerprint():
+    assert fingerprint_objects([make_rig()], SETTINGS) == fingerprint_objects([make_rig()], SETTINGS)
+    assert fingerprint_objects([make_rig(tail_z=1.0)], SETTINGS) != fingerprint_objects([make_rig(tail_z=2.0)], SETTINGS)
+
+
+def test_armature_pose_changes_fingerprint():
+    assert fingerprint_objects([make_rig()], SETTINGS) != fingerprint_objects([make_rig(pose_location=(0.0, 1.0, 0.0))], SETTINGS)
+
+
+def test_modifier_target_transform_changes_fingerprint():
+    def fingerprint(target_location):
+        target = make_object("Target", location=target_location)
+        modifier = rna_struct(type="ARRAY", object=target)
+        return fingerprint_objects([make_object("Asset", modifiers=[modifier])], SETTINGS)
+
+    assert fingerprint((0.0, 0.0, 0.0)) == fingerprint((0.0, 0.0, 0.0))
+    assert fingerprint((0.0, 0.0, 0.0)) != fingerprint((2.0, 0.0, 0.0))
+
+
+def test_same_name_in_different_sub_folders(tmp_path):
+    export_folder = str(tmp_path)
+    props = os.path.join(export_folder, "Props", "Kit.fbx")
+    walls = os.path.join(export_folder, "Walls", "Kit.fbx")
+    for path in (props, walls):
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(path.encode("utf-8"))
+
+    manifest = ExportManifest(export_folder)
+    manifest.update(props, "props_fingerprint")
+    manifest.update(walls, "walls_fingerprint")
+    manifest.save()
+
+    manifest = ExportManifest(export_folder).load()
+    assert sorted(manifest.entries) == ["Props/Kit.fbx", "Walls/Kit.fbx"]
+    assert manifest.is_up_to_date(props, "props_fingerprint")
+    assert manifest.is_up_to_date(walls, "walls_fingerprint")
@@ -0,0 +1,55 @@
+from core.version_control.perforce_manager import normalize_path
+
+
+def test_changelist_flow(fake_depot, perforce_manager):
+    checked_in = fake_depot.check_in("checked_in.fbx")
+    default_opened = fake_depot.check_in("default_opened.fbx")
+    fake_depot.open("default_opened.fbx")
+    users_pending = fake_depot.check_in("users_pending.fbx")
+    fake_depot.open("users_pending.fbx", change="7")
+    new = fake_depot.path("new.fbx")
+
+    changelist = perforce_manager.create_changelist("BBatch export from test.blend")
+    assert changelist == "1"
+
+    plan = perforce_manager.prepare_files_for_export([checked_in, default_opened, users_pending, new], changelist=changelist)
+    assert plan == {
+        normalize_path(checked_in): "EDIT",
+        normalize_path(default_opened): "EDIT",
+        normalize_path(users_pending): "EDIT",
+        normalize_path(new): "ADD",
+    }
+
+    # The export rewrites the user's default changelist file and writes the new one, checked_in stays identical
+    fake_depot.write_file("default_opened.fbx", b"changed")
+    fake_depot.write_file("new.fbx")
+    assert perforce_manager.add_files([new], changelist=changelist)
+
+    opened = fake_depot.opened()
+    assert {path: entry["change"] for path, entry in opened.items()} == {
+        normalize_path(checked_in): "1",
+        normalize_path(default_opened): "1",
+        normalize_path(users_pending): "7",
+        normalize_path(new): "1",
+    }
+
+    assert perforce_manager.revert_unchanged(changelist) == [normalize_path(checked_in)]
+    assert not perforce_manager.delete_changelist_if_empty(changelist)
+
+    opened = fake_depot.opened()
+    assert normalize_path(checked_in) not in opened
+    assert opened[normalize_path(users_pending)]["change"] == "7"
+    assert changelist in fake_depot.load()["changes"]
+
+
+def test_changelist_of_identical_files_is_deleted(fake_depot, perforce_manager):
+    first = fake_depot.check_in("first.fbx")
+    second = fake_depot.check_in("second.fbx")
+
+    changelist = perforce_manager.create_changelist("BBatch export from test.blend")
+    perforce_manager.prepare_files_for_export([first, second], changelist=changelist)
+
+    assert sorted(perforce_manager.revert_unchanged(changelist)) == sorted([normalize_path(first), normalize_path(second)])
+    assert perforce_manager.delete_changelist_if_empty(changelist)
+    assert fake_depot.opened() == {}
+    assert fake_depot.load()["changes"] == []
@@ -0,0 +1,73 @@
+from core.version_control.perforce_manager import normalize_path
+from core.version_control.perforce_session import PerforceError
+
+
+def test_get_file_statuses(fake_depot, perforce_manager):
+    checked_in = fake_depot.check_in("checked_in.fbx")
+    opened = fake_depot.check_in("opened.fbx")
+    fake_depot.open("opened.fbx")
+    new = fake_depot.path("new.fbx")
+
+    statuses = perforce_manager.get_file_statuses([checked_in, opened, new])
+
+    assert statuses == {
+        normalize_path(checked_in): "CHECKED_IN",
+        normalize_path(opened): "OPENED",
+        normalize_path(new): "NEW",
+    }
+
+
+def test_prepare_files_for_export(fake_depot, perforce_manager):
+    checked_in = fake_depot.check_in("checked_in.fbx")
+    new = fake_depot.path("new.fbx")
+
+    plan = perforce_manager.prepare_files_for_export([checked_in, new])
+
+    assert plan == {normalize_path(checked_in): "EDIT", normalize_path(new): "ADD"}
+    assert fake_depot.opened()[normalize_path(checked_in)]["action"] == "edit"
+    assert normalize_path(new) not in fake_depot.opened()
+
+
+def test_prepare_files_for_export_reports_failed_edits(fake_depot, perforce_manager):
+    checked_in = fake_depot.check_in("checked_in.fbx")
+    # Deleted from the depot after the status was read, the edit is refused
+    perforce_manager.get_file_statuses = lambda paths: {normalize_path(path): "CHECKED_IN" for path in paths}
+    missing = fake_depot.path("missing.fbx")
+
+    plan = perforce_manager.prepare_files_for_export([checked_in, missing])
+
+    assert plan == {normalize_path(checked_in): "EDIT", normalize_path(missing): "FAILED"}
+
+
+def test_add_files(fake_depot, perforce_manager):
+    first = fake_depot.write_file("first.fbx")
+    second = fake_depot.write_file("second.fbx")
+    never_written = fake_depot.path("never_written.fbx")
+
+    assert perforce_manager.add_files([first, second, never_written])
+
+    opened = fake_depot.opened()
+    assert {path: entry["action"] for path, entry in opened.items()} == {
+        normalize_path(first): "add",
+        normalize_path(second): "add",
+    }
+    assert all(entry["change"] == "default" for entry in opened.values())
+
+
+def test_interrupted_edit_keeps_the_files_it_opened(fake_depot, perforce_manager):
+    first = fake_depot.check_in("first.fbx")
+    second = fake_depot.check_in("second.fbx")
+    session = perforce_manager.session
+    run = session.run
+
+    def run_edit_then_time_out(*command, **kwargs):
+        # Only the first file is opened before the call is killed
+        if command[0] == "edit":
+            run(*command, filepaths=kwargs["filepaths"][:1])
+            raise PerforceError("Could not run p4 edit: timed out")
+        return run(*command, **kwargs)
+
+    session.run = run_edit_then_time_out
+    plan = perforce_manager.prepare_files_for_export([first, second])
+
+    assert plan == {normalize_path(first): "EDIT", normalize_path(second): "FAILED"}
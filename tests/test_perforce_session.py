@@ -0,0 +1,44 @@
+import subprocess
+
+from core.version_control.perforce_session import PerforceSession
+
+
+def test_ticket_is_passed_through_the_environment(monkeypatch):
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append((args, kwargs.get("env")))
+        return subprocess.CompletedProcess(args, 0, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    session = PerforceSession("p4")
+    session.configure("ssl:perforce:1666", "artist", "artist_ws")
+    session.ticket = "SECRETTICKET"
+
+    session.run("fstat", filepaths=["a.fbx"])
+
+    args, env = calls[0]
+    assert "SECRETTICKET" not in args
+    assert env["P4PASSWD"] == "SECRETTICKET"
+
+
+def test_no_ticket_inherits_the_environment(monkeypatch):
+    calls = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **kwargs: calls.append(kwargs.get("env")) or subprocess.CompletedProcess(args, 0, b"", b""))
+
+    PerforceSession("p4").run("info")
+
+    assert calls == [None]
+
+
+def test_batched_calls_scale_the_timeout(monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(subprocess, "run", lambda args, **kwargs: timeouts.append(kwargs["timeout"]) or subprocess.CompletedProcess(args, 0, b"", b""))
+    session = PerforceSession("p4")
+    session.timeout = 15
+
+    session.run("info")
+    session.run("fstat", filepaths=[f"asset_{index}.fbx" for index in range(50)])
+    session.run("edit", filepaths=[f"asset_{index}.fbx" for index in range(250)])
+
+    assert timeouts == [15, 15, 45]
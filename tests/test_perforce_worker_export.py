@@ -0,0 +1,67 @@
+import time
+import importlib
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+from core.version_control.perforce_manager import normalize_path  # noqa: E402
+
+
+def run_on_worker(worker, name, perforce_job):
+    """Run an exporter's Perforce job on the worker thread and wait for it the way the modal operator does."""
+    job = worker.submit(name, perforce_job)
+    deadline = time.monotonic() + 30
+    while worker.deliver():
+        assert time.monotonic() < deadline, f"Perforce {name} did not finish"
+        time.sleep(0.01)
+    assert job.error is None
+    return job.result
+
+
+def test_export_with_perforce_jobs_on_the_worker(blender_addon, fake_depot):
+    package = blender_addon.__name__
+    worker = importlib.import_module(f"{package}.core.version_control.perforce_worker").PerforceWorker()
+    preferences = bpy.context.preferences.addons[package].preferences
+    preferences.p4_cache_ttl = 0
+    preferences.p4_use_changelist = True
+
+    mesh = bpy.data.meshes.new("SM_Crate")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    crate = bpy.data.objects.new("SM_Crate", mesh)
+    barrel = bpy.data.objects.new("SM_Barrel", mesh.copy())
+    for obj in (crate, barrel):
+        bpy.context.scene.collection.objects.link(obj)
+    checked_in = fake_depot.check_in("SM_Crate.fbx")
+
+    props = bpy.context.scene.panel_properties
+    props.export_source = "SELECTION"
+    exporter = importlib.import_module(f"{package}.core.exporters").get_exporter_class(".fbx")(
+        bpy.context,
+        export_objects=[crate, barrel],
+        export_folder=fake_depot.folder,
+        use_perforce=True,
+        incremental_export=False,
+        show_report=False,
+        post_export_stages=(),
+        use_journal=False,
+    )
+    try:
+        exporter.prepare_export()
+        exporter.apply_perforce_plan(*run_on_worker(worker, "checkout", exporter.get_perforce_plan_job()))
+        exporter.start_export()
+        while exporter.export_next():
+            pass
+        exporter.stop_export()
+        exporter.apply_perforce_finish(run_on_worker(worker, "add", exporter.get_perforce_finish_job()))
+        exporter.complete_export()
+    finally:
+        worker.stop()
+        for obj in (crate, barrel):
+            bpy.data.objects.remove(obj)
+
+    assert not exporter.skipped_exports
+    opened = fake_depot.opened()
+    assert opened[normalize_path(checked_in)]["action"] == "edit"
+    assert opened[normalize_path(fake_depot.path("SM_Barrel.fbx"))]["action"] == "add"
+    assert {entry["change"] for entry in opened.values()} == {exporter.changelist}
@@ -0,0 +1,32 @@
+import os
+
+from core.post_export import PostExportPipeline
+
+
+def write(path, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_mirror_keeps_the_sub_folders(tmp_path):
+    export_folder = str(tmp_path / "export")
+    mirror_folder = str(tmp_path / "mirror")
+    props = os.path.join(export_folder, "Props", "Kit.fbx")
+    walls = os.path.join(export_folder, "Walls", "Kit.fbx")
+    root = os.path.join(export_folder, "Crate.fbx")
+    write(props, b"props")
+    write(walls, b"walls")
+    write(root, b"crate")
+
+    pipeline = PostExportPipeline({"MIRROR"}, worker_count=2, mirror_folder=mirror_folder, export_folder=export_folder)
+    for path in (props, walls, root):
+        pipeline.submit(path)
+    pipeline.drain()
+
+    assert not pipeline.errors
+    with open(os.path.join(mirror_folder, "Props", "Kit.fbx"), "rb") as f:
+        assert f.read() == b"props"
+    with open(os.path.join(mirror_folder, "Walls", "Kit.fbx"), "rb") as f:
+        assert f.read() == b"walls"
+    assert os.path.isfile(os.path.join(mirror_folder, "Crate.fbx"))
@@ -0,0 +1,54 @@
+import importlib
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+
+@pytest.fixture
+def objects():
+    """A visible, a hidden and a selected object in the view layer, and one that is not linked to the scene."""
+    created = {name: bpy.data.objects.new(name, None) for name in ("Visible", "Hidden", "Selected", "Unlinked")}
+    for name in ("Visible", "Hidden", "Selected"):
+        bpy.context.scene.collection.objects.link(created[name])
+    view_layer = bpy.context.view_layer
+    view_layer.update()
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    created["Hidden"].hide_set(True)
+    created["Selected"].select_set(True)
+
+    yield created
+    for obj in created.values():
+        bpy.data.objects.remove(obj)
+
+
+def make_exporter(blender_addon, tmp_path):
+    exporter_class = importlib.import_module(f"{blender_addon.__name__}.core.exporters").get_exporter_class(".fbx")
+    exporter = exporter_class(bpy.context, export_objects=(), export_folder=str(tmp_path), use_perforce=False)
+    exporter.store_selection()
+    return exporter
+
+
+def test_hidden_objects_are_not_recorded_as_selected(blender_addon, objects, tmp_path):
+    exporter = make_exporter(blender_addon, tmp_path)
+
+    exporter.select_objects([objects["Visible"], objects["Hidden"]])
+
+    assert exporter.selected_objects == {objects["Visible"]}
+    assert set(bpy.context.view_layer.objects.selected) == {objects["Visible"]}
+
+    exporter.restore_selection()
+    assert set(bpy.context.view_layer.objects.selected) == {objects["Selected"]}
+
+
+def test_failed_select_keeps_the_deltas_in_sync(blender_addon, objects, tmp_path):
+    exporter = make_exporter(blender_addon, tmp_path)
+
+    # Objects outside the view layer cannot be selected, the changes made before still count
+    with pytest.raises(RuntimeError):
+        exporter.select_objects([objects["Visible"], objects["Unlinked"]])
+
+    assert exporter.selected_objects == set(bpy.context.view_layer.objects.selected)
+    exporter.restore_selection()
+    assert set(bpy.context.view_layer.objects.selected) == {objects["Selected"]}